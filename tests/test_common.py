@@ -56,6 +56,21 @@ def test_normalization_range(left, right, alg):
     assert 0 <= alg.normalized_similarity(left, right) <= 1
 
 
+@pytest.mark.parametrize('alg', ALGS)
+@hypothesis.given(
+    left=hypothesis.strategies.text(),
+    right=hypothesis.strategies.text(),
+    max_distance=hypothesis.strategies.floats(min_value=0, max_value=1),
+)
+def test_normalization_max_distance(left, right, max_distance, alg):
+    expected = alg.normalized_distance(left, right)
+    if expected > max_distance:
+        expected = 1
+    actual = alg.normalized_distance(left, right, max_distance=max_distance)
+    assert isclose(actual, expected)
+    assert 0 <= alg.normalized_similarity(left, right, max_distance=max_distance) <= 1
+
+
 @pytest.mark.parametrize('alg', ALGS)
 @hypothesis.given(
     left=hypothesis.strategies.text(),
@@ -106,3 +121,12 @@ def test_empty(alg):
 def test_unequal_distance(alg):
     if alg.maximum('', 'qwertyui'):
         assert alg.distance('', 'qwertyui') > 0
+
+
+@pytest.mark.parametrize('alg', ALGS)
+@hypothesis.given(
+    left=hypothesis.strategies.text(),
+    right=hypothesis.strategies.text(),
+)
+def test_compile(left, right, alg):
+    assert alg.compile(left)(right) == alg(left, right)
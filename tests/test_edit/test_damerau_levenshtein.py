@@ -24,6 +24,10 @@ COMMON = [
     ('ab', 'cde', 3),
     ('ab', 'ac', 1),
     ('ab', 'bc', 2),
+
+    ('The Lord of the Rings', 'The Lrod of the Ringz', 2),
+    ('abcab', 'abab', 1),
+    ('testing', 'test', 3),
 ]
 
 
@@ -41,6 +45,9 @@ def test_distance_restricted(left, right, expected):
     actual = ALG()._pure_python_restricted(left, right)
     assert actual == expected
 
+    actual = ALG()._bit_parallel(left, right)
+    assert actual == expected
+
 
 @pytest.mark.parametrize('left, right, expected', COMMON + [
     ('ab', 'bca', 2),
@@ -55,3 +62,35 @@ def test_distance_unrestricted(left, right, expected):
 
     actual = ALG()._pure_python_unrestricted(left, right)
     assert actual == expected
+
+
+@pytest.mark.parametrize('left, right, expected', [
+    ('ab' * 40, 'ba' * 40, 2),
+    ('abcd' * 20, 'bacd' * 20, 20),
+    ('a' * 70, 'b' * 70, 70),
+    ('x' + 'abc' * 30, 'abc' * 30 + 'y', 2),
+])
+def test_distance_restricted_long(left, right, expected):
+    assert ALG(external=False)(left, right) == expected
+    assert ALG()._pure_python_restricted(left, right) == expected
+    assert ALG()._bit_parallel(left, right) == expected
+    assert ALG()._bit_parallel(right, left) == expected
+
+
+def test_unhashable_elements():
+    actual = ALG(external=False)([[1], [2], [3]], [[2], [1], [3]])
+    assert actual == 1
+    actual = ALG(external=False)([[1]] * 70, [[2]] * 70)
+    assert actual == 70
+
+
+@pytest.mark.parametrize('left, right, expected', [
+    ('ab' * 40, 'ba' * 40, 2),
+    ('abcd' * 20, 'bdac' * 20, 23),
+    ('ba' * 30, 'acb' * 30, 32),
+    ('x' + 'abc' * 30, 'abc' * 30 + 'y', 2),
+])
+def test_distance_unrestricted_long(left, right, expected):
+    assert ALG(external=False, restricted=False)(left, right) == expected
+    assert ALG()._pure_python_unrestricted(left, right) == expected
+    assert ALG()._pure_python_unrestricted(right, left) == expected
@@ -52,3 +52,120 @@ def test_distance_ident_with_gap_05(left, right, expected):
 def test_distance_ident_with_gap_5(left, right, expected):
     actual = ALG(gap_open=5, gap_ext=5, sim_func=sim_ident)(left, right)
     assert actual == expected
+
+
+@pytest.mark.parametrize('left, right, expected', [
+    ('AGACTAGTTAC', 'TGACGSTGC', 1.5),
+    ('AGACTAGTTAC', 'CGAGACGT', 1),
+    ('GATTACA', '', -4),
+    ('', '', 0),
+])
+def test_numpy(left, right, expected):
+    pytest.importorskip('numpy')
+    actual = ALG(gap_open=1, gap_ext=.5, sim_func=sim_ident)._numpy(left, right)
+    assert actual == expected
+    assert type(actual) is float
+
+
+@pytest.mark.parametrize('left, right', [
+    ('AGACTAGTTACCGATATCAGGATTACA', 'CGAGACGTTGACGSTGCGCATGCU'),
+    ('GATTACA' * 5, 'GCATGCU' * 4),
+])
+def test_distance_long(left, right):
+    sim_matrix = textdistance.Matrix(NW_MATRIX, symmetric=True)
+    alg = ALG(gap_open=3, gap_ext=.5, sim_func=sim_matrix)
+    # unhashable elements fall back to the scalar implementation
+    expected = ALG(gap_open=3, gap_ext=.5, sim_func=lambda x, y: sim_matrix(x[0], y[0]))(
+        [[c] for c in left], [[c] for c in right],
+    )
+    assert alg(left, right) == expected
+
+
+@pytest.mark.parametrize('left, right', [
+    ('AGACTAGTTAC', 'CGAGACGT'),
+    ('AGACTAGTTACCGATATCAGGATTACA', 'CGAGACGTTGACGTGCGCATGCT'),
+])
+def test_sim_matrix(left, right):
+    sim_matrix = textdistance.Matrix(NW_MATRIX, symmetric=True)
+    expected = ALG(gap_open=3, gap_ext=.5, sim_func=sim_matrix)(left, right)
+    assert ALG(gap_open=3, gap_ext=.5, sim_matrix=NW_MATRIX)(left, right) == expected
+
+
+@pytest.mark.parametrize('left, right, expected', [
+    ('AGACTAGTTAC', 'TGACGSTGC', 1.5),
+    ('AGACTAGTTAC', 'CGAGACGT', 1),
+    ('GATTACA', '', -4),
+    ('', '', 0),
+])
+def test_pure_python(left, right, expected):
+    actual = ALG(gap_open=1, gap_ext=.5, sim_func=sim_ident)._pure_python(left, right)
+    assert actual == expected
+
+
+@pytest.mark.parametrize('left, right', [
+    ('AGACTAGTTACCGATATCAGGATTACA', 'AGACTAGTACCGATATCAGGATTTACA'),
+    ('GATTACA' * 5, 'GATTACA' * 4),
+])
+@pytest.mark.parametrize('band', [2, 4])
+def test_band(left, right, band):
+    sim_matrix = textdistance.Matrix(NW_MATRIX, symmetric=True)
+    expected = ALG(gap_open=3, gap_ext=.5, sim_func=sim_matrix)(left, right)
+    alg = ALG(gap_open=3, gap_ext=.5, sim_func=sim_matrix, band=band)
+    assert alg(left, right) == expected
+    assert alg._pure_python(left, right) == expected
+
+
+@pytest.mark.parametrize('band', [0, 1])
+def test_band_narrow(band):
+    # the best alignment shifts the right sequence by 2 elements
+    left = 'ATCATCATCATCATGGG'
+    right = left[2:] + 'AT'
+    expected = ALG(gap_open=1, gap_ext=.5, sim_func=sim_ident)(left, right)
+    alg = ALG(gap_open=1, gap_ext=.5, sim_func=sim_ident, band=band)
+    actual = alg._pure_python(left, right)
+    assert actual < expected
+    pytest.importorskip('numpy')
+    assert alg._numpy(left, right) == actual
+
+
+@pytest.mark.parametrize('left, right, expected', [
+    # one long gap is cheaper than two short ones
+    ('AAAGGGTTT', 'AAATTT', ('AAAGGGTTT', 'AAA---TTT')),
+    ('GATTACA', '', ('GATTACA', '-------')),
+    ('', '', ('', '')),
+])
+def test_align(left, right, expected):
+    assert ALG(gap_open=2, gap_ext=.1).align(left, right) == expected
+
+
+@pytest.mark.parametrize('left, right', [
+    ('AGACTAGTTAC', 'CGAGACGT'),
+    ('AGACTAGTTAC', 'TGACGSTGC'),
+    ('AGACTAGTTACCGATATCAGGATTACA', 'CGAGACGTTGACGSTGCGCATGCU'),
+])
+def test_align_score(left, right):
+    alg = ALG(gap_open=2, gap_ext=.5, sim_func=sim_ident)
+    aligned1, aligned2 = alg.align(left, right)
+    assert aligned1.replace('-', '') == left
+    assert aligned2.replace('-', '') == right
+    score = 0
+    previous = None
+    for pair in zip(aligned1, aligned2):
+        if '-' not in pair:
+            score += sim_ident(*pair)
+            previous = None
+            continue
+        gap = pair.index('-')
+        score -= .5 if gap == previous else 2
+        previous = gap
+    assert score == alg(left, right)
+
+
+def test_max_distance():
+    alg = ALG()
+    assert alg.distance('GATTACA', 'GCATGCU', max_distance=-4) == -3
+    assert alg.distance('GATTACA', 'GCATGCU', max_distance=-3) == -3
+    assert alg.normalized_distance('GATTACA', 'GCATGCU', max_distance=.2) == 1
+    assert alg.normalized_distance('GATTACA', 'GCATGCU', max_distance=.5) == 2 / 7
+    assert alg.normalized_similarity('GATTACA', 'GCATGCU', max_distance=.2) == 0
+    assert alg.normalized_similarity('GATTACA', 'GCATGCU', max_distance=.5) == 5 / 7
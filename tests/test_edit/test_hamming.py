@@ -22,3 +22,104 @@ def test_distance(left, right, expected):
 
     actual = ALG(external=True)(left, right)
     assert actual == expected
+
+
+@pytest.mark.parametrize('left, right, expected', [
+    (b'test', b'text', 1),
+    (b'test', b'testit', 2),
+    (bytearray(b'test'), memoryview(b'tset'), 2),
+    (b'\x00\xff', b'\x01\xff', 1),
+    (b'\x00\xff', b'\xff\x00', 2),
+])
+def test_bytes(left, right, expected):
+    actual = ALG(external=False)(left, right)
+    assert actual == expected
+
+    actual = ALG(test_func=lambda x, y: x == y)(left, right)
+    assert actual == expected
+
+
+@pytest.mark.parametrize('left, right, truncate, expected', [
+    (b'\x00\xff', b'\x01\xff', False, 1),
+    (b'\x00\xff', b'\xff\x00', False, 16),
+    (b'\x0f', b'\x0f\xff\x01', False, 16),
+    (b'\x0f', b'\x1f\xff\x01', True, 1),
+])
+def test_bits(left, right, truncate, expected):
+    actual = ALG(bits=True, truncate=truncate)(left, right)
+    assert actual == expected
+
+
+def test_bits_unsupported():
+    with pytest.raises(TypeError):
+        ALG(bits=True)('test', 'text')
+
+
+def test_numpy():
+    numpy = pytest.importorskip('numpy')
+    left = numpy.array([1, 2, 3, 4], dtype=numpy.uint16)
+    right = numpy.array([1, 2, 7, 0, 5], dtype=numpy.uint16)
+    assert ALG()(left, right) == 3
+    assert ALG(truncate=True)(left, right) == 2
+    assert ALG(bits=True)(left, right) == 1 + 1 + 16
+    assert ALG(bits=True).maximum(left, right) == 5 * 16
+
+
+def test_batch():
+    numpy = pytest.importorskip('numpy')
+    codes = numpy.array([
+        [0b0000, 0b1111],
+        [0b0001, 0b1111],
+        [0b1111, 0b0000],
+    ], dtype=numpy.uint8)
+    query = codes[0]
+
+    assert ALG().batch(query, codes).tolist() == [0, 1, 2]
+    assert ALG(bits=True).batch(query, codes).tolist() == [0, 1, 8]
+    assert ALG(bits=True).batch(query.tobytes(), codes).tolist() == [0, 1, 8]
+    assert ALG(bits=True).batch(query.tobytes(), [c.tobytes() for c in codes]) == [0, 1, 8]
+    assert ALG().batch('test', ['text', 'tset']) == [1, 2]
+
+
+def test_batch_str():
+    numpy = pytest.importorskip('numpy')
+    codes = numpy.array([list('text'), list('tset'), list('test')])
+    assert ALG().batch('test', codes).tolist() == [1, 2, 0]
+    assert ALG().batch(['t', 'e', 's', 't'], codes).tolist() == [1, 2, 0]
+    assert ALG(truncate=True).batch('tes', codes).tolist() == [1, 2, 0]
+
+
+CODES = [
+    b'\x00\x00\x00\x00',
+    b'\x01\x00\x00\x00',
+    b'\x03\x00\x00\x80',
+    b'\xff\xff\xff\xff',
+    b'\x00\x00\x00\x00',
+]
+
+
+@pytest.mark.parametrize('chunks', [1, 2, 4, 8])
+def test_index_bits(chunks):
+    index = textdistance.HammingIndex(CODES, chunks=chunks, bits=True)
+    query = b'\x00\x00\x00\x00'
+    assert index.within(query, 0) == [(0, 0), (4, 0)]
+    assert index.within(query, 1) == [(0, 0), (4, 0), (1, 1)]
+    assert index.within(query, 3) == [(0, 0), (4, 0), (1, 1), (2, 3)]
+    assert index.nearest(query, 3) == [(0, 0), (4, 0), (1, 1)]
+    assert index.nearest(query, 10)[-1] == (3, 32)
+
+
+def test_index_items():
+    codes = ['test', 'text', 'tset', 'qwer']
+    index = textdistance.HammingIndex(codes, chunks=2)
+    assert index.within('test', 1) == [(0, 0), (1, 1)]
+    assert index.within('test', 2) == [(0, 0), (1, 1), (2, 2)]
+    assert index.nearest('qwet', 1) == [(3, 1)]
+
+
+def test_index_different_length():
+    with pytest.raises(ValueError):
+        textdistance.HammingIndex(['test', 'tests'])
+    index = textdistance.HammingIndex(['test'])
+    with pytest.raises(ValueError):
+        index.within('tests', 1)
@@ -28,3 +28,54 @@ def test_distance(left, right, expected):
 
     actual = ALG(winklerize=True, external=True)(left, right)
     assert isclose(actual, expected)
+
+    actual = ALG(winklerize=True).compile(left)(right)
+    assert isclose(actual, expected)
+
+
+@pytest.mark.parametrize('left, right', [
+    ('MARTHA', 'MARHTA'),
+    ('DIXON', 'DICKSONX'),
+    ('abcdefghij' * 8, 'bacdefghji' * 8),
+    ('x' * 10 + 'abcdefghij' * 5, 'abcdefghij' * 5 + 'y' * 10),
+])
+def test_bit_parallel(left, right):
+    expected = ALG()._matches(left, right)
+    assert ALG()._bit_parallel(left, right) == expected
+    assert ALG()._bit_parallel(right, left) == expected
+
+
+def test_unhashable_elements():
+    actual = ALG(external=False)([[1], [2], [3]], [[1], [3], [2]])
+    assert isclose(actual, ALG(external=False)('abc', 'acb'))
+
+
+@pytest.mark.parametrize('left, right', [
+    ('elephant', 'hippo'),
+    ('MARTHA', 'MARHTA'),
+    ('DWAYNE', 'DUANE'),
+    ('DIXON', 'DICKSONX'),
+    ('duck donald', 'duck daisy'),
+    ('test', 'test'),
+    ('test', ''),
+])
+def test_upper_bound(left, right):
+    actual = ALG(external=False)(left, right)
+    assert ALG().upper_bound(left, right) >= actual
+    assert ALG(long_tolerance=True).upper_bound(left, right) >= actual
+
+
+@pytest.mark.parametrize('left, right, score_cutoff, expected', [
+    ('MARTHA', 'MARHTA', 0.9, 0.9611111111111111),
+    ('MARTHA', 'MARHTA', 0.97, 0),
+    ('DWAYNE', 'DUANE', 0.84, 0.84),
+    ('DWAYNE', 'DUANE', 0.85, 0),
+    ('fly', 'ant', 0.5, 0),
+    ('elephant', 'pig', 0.85, 0),
+])
+def test_score_cutoff(left, right, score_cutoff, expected):
+    actual = ALG(external=False)(left, right, score_cutoff=score_cutoff)
+    assert isclose(actual, expected)
+
+    actual = ALG(external=False).compile(left)(right, score_cutoff=score_cutoff)
+    assert isclose(actual, expected)
@@ -22,3 +22,206 @@ def test_distance(left, right, expected):
 
     actual = ALG(external=True)(left, right)
     assert actual == expected
+
+    actual = ALG()._cycled(left, right)
+    assert actual == expected
+
+    actual = ALG()._bit_parallel(left, right)
+    assert actual == expected
+
+    actual = ALG()._numpy(left, right)
+    assert actual == expected
+
+
+@pytest.mark.parametrize('left, right, expected', [
+    ('kitten' * 20, 'sitting' * 20, 60),
+    ('a' * 70, 'b' * 70, 70),
+    ('ab' * 40, 'ba' * 40, 2),
+    ('x' + 'abc' * 30, 'abc' * 30 + 'y', 2),
+])
+def test_distance_long(left, right, expected):
+    assert ALG()._cycled(left, right) == expected
+    assert ALG()._bit_parallel(left, right) == expected
+    assert ALG()._bit_parallel(right, left) == expected
+    assert ALG()._numpy(left, right) == expected
+
+
+@pytest.mark.parametrize('left, right', [
+    ('test', 'test'),
+    ('tests', 'test'),
+    ('test', 'tent'),
+    ('abab', 'ab'),
+    ('abcab', 'abab'),
+    ('The Lord of the Rings', 'The Lord of The Rings'),
+    ('Baker Street 221b', 'Baker st. 221b'),
+])
+def test_common_affix(left, right):
+    expected = ALG()._cycled(left, right)
+    assert ALG(external=False)(left, right) == expected
+    assert ALG(external=False)(right, left) == expected
+
+    # the prefix and the suffix are skipped for any `test_func`
+    test_func = lambda x, y: x.lower() == y.lower()  # noqa: E731
+    expected = ALG(test_func=test_func)._cycled(left, right)
+    assert ALG(test_func=test_func)(left, right) == expected
+
+
+def test_unhashable_elements():
+    actual = ALG(external=False)([[1], [2], [3]], [[1], [3]])
+    assert actual == 1
+
+
+@pytest.mark.parametrize('left, right, max_distance, expected', [
+    ('test', 'text', 1, 1),
+    ('test', 'text', 0, 1),
+    ('test', 'tset', 1, 2),
+    ('test', 'testit', 1, 2),
+    ('test', 'testit', 2, 2),
+    ('test', 'qwe', 2, 3),
+    ('test', 'test', 0, 0),
+    ('', 'test', 3, 4),
+    ('kitten' * 20, 'sitting' * 20, 10, 11),
+])
+def test_max_distance(left, right, max_distance, expected):
+    actual = ALG(external=False)(left, right, max_distance=max_distance)
+    assert actual == expected
+
+    actual = ALG(external=False).distance(left, right, max_distance=max_distance)
+    assert actual == expected
+
+    actual = ALG(external=True)(left, right, max_distance=max_distance)
+    assert actual == expected
+
+    # banded DP for custom `test_func`
+    actual = ALG(test_func=lambda x, y: x == y)(left, right, max_distance=max_distance)
+    assert actual == expected
+
+
+@pytest.mark.parametrize('left, right, max_distance, expected', [
+    ('test', 'text', .25, .25),
+    ('test', 'text', .2, 1),
+    ('test', 'tset', .5, .5),
+    ('test', 'tset', .49, 1),
+])
+def test_normalized_max_distance(left, right, max_distance, expected):
+    alg = ALG(external=False)
+    actual = alg.normalized_distance(left, right, max_distance=max_distance)
+    assert actual == expected
+    actual = alg.normalized_similarity(left, right, max_distance=max_distance)
+    assert actual == 1 - expected
+
+
+@pytest.mark.parametrize('qval', [1, 2, None])
+@pytest.mark.parametrize('left, right', [
+    ('test', 'text'),
+    ('test', 'testit'),
+    ('test', ''),
+    ('qwe rty', 'qwe rt y'),
+])
+def test_compile(left, right, qval):
+    alg = ALG(qval=qval, external=False)
+    compiled = alg.compile(left)
+    assert compiled(right) == alg(left, right)
+    assert compiled(right, max_distance=1) == alg(left, right, max_distance=1)
+
+
+@pytest.mark.parametrize('left, right, expected', [
+    ('qabxcd', 'abycdf', [
+        ('delete', 0, 1, 0, 0),
+        ('equal', 1, 3, 0, 2),
+        ('replace', 3, 4, 2, 3),
+        ('equal', 4, 6, 3, 5),
+        ('insert', 6, 6, 5, 6),
+    ]),
+    ('test', 'test', [('equal', 0, 4, 0, 4)]),
+    ('', 'ab', [('insert', 0, 0, 0, 2)]),
+    ('ab', '', [('delete', 0, 2, 0, 0)]),
+])
+def test_opcodes(left, right, expected):
+    assert ALG().opcodes(left, right) == expected
+    assert ALG(test_func=lambda x, y: x == y).opcodes(left, right) == expected
+
+
+@pytest.mark.parametrize('left, right', [
+    ('test', 'text'),
+    ('test', 'tset'),
+    ('kitten' * 10, 'sitting' * 10),
+    ('GATTACA' * 7, 'GCATGCU' * 5),
+])
+def test_editops(left, right):
+    for alg in (ALG(), ALG(test_func=lambda x, y: x == y)):
+        ops = alg.editops(left, right)
+        assert len(ops) == alg(left, right)
+
+        # apply operations from the end to keep positions valid
+        result = list(left)
+        for tag, i, j in reversed(ops):
+            if tag == 'replace':
+                result[i] = right[j]
+            elif tag == 'delete':
+                del result[i]
+            else:
+                result.insert(i, right[j])
+        assert ''.join(result) == right
+
+
+KEYBOARD = {
+    ('q', 'w'): .5, ('w', 'q'): .5,
+    ('e', 'w'): .5, ('w', 'e'): .5,
+    ('x', None): 3,
+    (None, 'x'): 3,
+}
+
+
+@pytest.mark.parametrize('left, right, weights, costs, expected', [
+    ('test', 'text', (1, 1, 1), None, 1),
+    ('test', 'text', (1, 1, 2), None, 2),
+    ('test', 'tset', (1, 1, 2), None, 2),
+    ('test', 'testit', (.5, 1, 1), None, 1),
+    ('test', 'tet', (1, 2, 1), None, 2),
+    ('qwe', 'wqw', (1, 1, 1), KEYBOARD, 1.5),
+    ('test', 'tesx', (1, 1, 1), KEYBOARD, 1),
+    ('tes', 'tesx', (1, 1, 1), KEYBOARD, 2),
+    ('', 'x', (1, 1, 1), KEYBOARD, 3),
+    ('x', '', (1, 1, 1), KEYBOARD, 3),
+    ('', 'ab', (2, 1, 1), None, 4),
+])
+def test_weighted(left, right, weights, costs, expected):
+    alg = ALG(weights=weights, costs=costs)
+    assert alg(left, right) == expected
+    assert alg.compile(left)(right) == expected
+    assert 0 <= alg.normalized_distance(left, right) <= 1
+
+    ops = alg.editops(left, right)
+    actual = 0
+    for tag, i, j in ops:
+        if tag == 'insert':
+            actual += (costs or {}).get((None, right[j]), weights[0])
+        elif tag == 'delete':
+            actual += (costs or {}).get((left[i], None), weights[1])
+        else:
+            actual += (costs or {}).get((left[i], right[j]), weights[2])
+    assert actual == expected
+
+
+@pytest.mark.parametrize('left, right', [
+    ('kitten' * 40, 'sitting' * 40),
+    ('qwerty' * 50, 'wqertx' * 45),
+])
+def test_weighted_numpy(left, right):
+    alg = ALG(weights=(1, 2, 1.5), costs=KEYBOARD)
+    expected = list(alg._rows(left, right))[-1][-1]
+    assert alg._numpy(left, right) == expected
+    assert alg(left, right) == expected
+
+
+def test_negative_costs():
+    with pytest.raises(ValueError):
+        ALG(weights=(1, -1, 1))
+
+
+def test_repr():
+    actual = repr(ALG(costs={('a', 'b'): .5}))
+    assert actual.startswith('Levenshtein(')
+    assert "'costs': {('a', 'b'): 0.5}" in actual
+    assert '_replace_costs' not in actual
@@ -27,3 +27,33 @@ def test_distance(left, right, expected):
 
     actual = ALG(external=True)(left, right)
     assert actual == expected
+
+
+@pytest.mark.parametrize('kwargs', [
+    {},
+    {'threshold': 0.1},
+    {'maxmismatches': 0},
+    {'threshold': 0.5, 'maxmismatches': 4},
+])
+def test_batch(kwargs):
+    numpy = pytest.importorskip('numpy')
+    words = ['Tomato', 'Tamato', 'Potato', 'tomato', 'Tomtom', 'abcdef']
+    codes = numpy.array([list(word) for word in words])
+    alg = ALG(external=False, **kwargs)
+
+    expected = [alg('Tomato', word) for word in words]
+    assert alg.batch(codes[0], codes).tolist() == expected
+    assert alg.batch('Tomato', words) == expected
+    assert alg.batch('Tomato', codes).tolist() == expected
+    assert ALG().batch('Tomato', numpy.array([list('Tomato'), list('Potato')])).tolist() == [1, 1]
+
+    # aligned arrays
+    expected = [alg(w1, w2) for w1, w2 in zip(words, reversed(words))]
+    assert alg.batch(codes[::-1], codes).tolist() == expected
+
+
+def test_batch_empty():
+    numpy = pytest.importorskip('numpy')
+    codes = numpy.zeros((3, 0), dtype=int)
+    assert ALG().batch(codes[0], codes).tolist() == [1, 1, 1]
+    assert ALG().batch(numpy.array([1]), codes).tolist() == [0, 0, 0]
@@ -30,6 +30,18 @@ def test_distance_matrix(left, right, expected):
     assert actual == expected
 
 
+@pytest.mark.parametrize('left, right, gap_cost, expected', [
+    ('test', 'text', 1, 3),
+    ('test', 'tesst', 1, 3),
+    ('abcab', 'abab', 0.5, 3.5),
+    ('GATTACA', 'GCATGCU', 1, 3),
+    ('The Lord of the Rings', 'The Lord of The Rings', 1, 20),
+])
+def test_distance_default(left, right, gap_cost, expected):
+    actual = ALG(gap_cost=gap_cost)(left, right)
+    assert actual == expected
+
+
 def sim_ident(x, y):
     if x == y:
         return 1
@@ -53,3 +65,162 @@ def test_distance_ident(left, right, expected):
 def test_distance_ident_with_gap_5(left, right, expected):
     actual = ALG(gap_cost=5, sim_func=sim_ident)(left, right)
     assert actual == expected
+
+
+@pytest.mark.parametrize('left, right, expected', [
+    ('AGACTAGTTAC', 'CGAGACGT', 16),
+    ('GATTACA', '', -35),
+    ('', 'GATTACA', -35),
+    ('', '', 0),
+])
+def test_numpy(left, right, expected):
+    pytest.importorskip('numpy')
+    sim_matrix = textdistance.Matrix(NW_MATRIX, symmetric=True)
+    actual = ALG(gap_cost=5, sim_func=sim_matrix)._numpy(left, right)
+    assert actual == expected
+    assert type(actual) is float
+
+
+@pytest.mark.parametrize('left, right', [
+    ('AGACTAGTTACCGATATCAGGATTACA', 'CGAGACGTTGACGSTGCGCATGCU'),
+    ('GATTACA' * 5, 'GCATGCU' * 4),
+])
+def test_distance_long(left, right):
+    sim_matrix = textdistance.Matrix(NW_MATRIX, symmetric=True)
+    alg = ALG(gap_cost=2, sim_func=sim_matrix)
+    # unhashable elements fall back to the scalar implementation
+    expected = ALG(gap_cost=2, sim_func=lambda x, y: sim_matrix(x[0], y[0]))(
+        [[c] for c in left], [[c] for c in right],
+    )
+    assert alg(left, right) == expected
+
+
+@pytest.mark.parametrize('left, right', [
+    ('AGACTAGTTAC', 'CGAGACGT'),
+    ('GATTACA', 'GCATGCT'),
+    ('AGACTAGTTACCGATATCAGGATTACA', 'CGAGACGTTGACGTGCGCATGCT'),
+])
+def test_sim_matrix(left, right):
+    sim_matrix = textdistance.Matrix(NW_MATRIX, symmetric=True)
+    expected = ALG(gap_cost=5, sim_func=sim_matrix)(left, right)
+    assert ALG(gap_cost=5, sim_matrix=sim_matrix)(left, right) == expected
+    assert ALG(gap_cost=5, sim_matrix=NW_MATRIX)(left, right) == expected
+
+    alphabet = 'ACGT'
+    array = [[sim_matrix(c1, c2) for c2 in alphabet] for c1 in alphabet]
+    assert ALG(gap_cost=5, sim_matrix=array, alphabet=alphabet)(left, right) == expected
+
+
+@pytest.mark.parametrize('left, right', [
+    ('GATTACA', 'GCATGCU'),
+    ('AGACTAGTTACCGATATCAGGATTACA', 'CGAGACGTTGACGSTGCGCATGCU'),
+])
+def test_sim_matrix_unknown_element(left, right):
+    with pytest.raises(ValueError):
+        ALG(sim_matrix=NW_MATRIX)(left, right)
+
+
+@pytest.mark.parametrize('kwargs', [
+    dict(sim_matrix=NW_MATRIX, sim_func=sim_ident),
+    dict(sim_matrix=[[1, -1], [-1, 1]]),
+    dict(sim_matrix=[[1, -1], [-1, 1]], alphabet='ACG'),
+    dict(sim_matrix=[[1, -1], [-1, 1]], alphabet='AA'),
+])
+def test_sim_matrix_invalid(kwargs):
+    with pytest.raises(ValueError):
+        ALG(**kwargs)
+
+
+@pytest.mark.parametrize('left, right, expected', [
+    ('AGACTAGTTAC', 'CGAGACGT', 16),
+    ('GATTACA', '', -35),
+    ('', 'GATTACA', -35),
+    ('', '', 0),
+])
+def test_pure_python(left, right, expected):
+    sim_matrix = textdistance.Matrix(NW_MATRIX, symmetric=True)
+    actual = ALG(gap_cost=5, sim_func=sim_matrix)._pure_python(left, right)
+    assert actual == expected
+
+
+@pytest.mark.parametrize('left, right', [
+    ('AGACTAGTTACCGATATCAGGATTACA', 'CGAGACGTTGACGSTGCGCATGCU'),
+    ('GATTACA' * 5, 'GCATGCU' * 4),
+])
+def test_dtype(left, right):
+    numpy = pytest.importorskip('numpy')
+    expected = ALG(gap_cost=.5)._pure_python(left, right)
+    actual = ALG(gap_cost=.5, dtype=numpy.float32)(left, right)
+    assert type(actual) is float
+    assert actual == pytest.approx(expected)
+
+
+@pytest.mark.parametrize('left, right', [
+    ('The Lord of the Rings', 'The Lord of The Rings'),
+    ('AGACTAGTTACCGATATCAGGATTACA', 'AGACTAGTACCGATATCAGGATTTACA'),
+    ('GATTACA' * 5, 'GATTACA' * 4),
+])
+@pytest.mark.parametrize('band', [2, 4])
+def test_band(left, right, band):
+    sim_matrix = textdistance.Matrix(NW_MATRIX, symmetric=True)
+    expected = ALG(gap_cost=2, sim_func=sim_matrix)(left, right)
+    alg = ALG(gap_cost=2, sim_func=sim_matrix, band=band)
+    assert alg(left, right) == expected
+    assert alg._pure_python(left, right) == expected
+
+
+@pytest.mark.parametrize('band, expected', [
+    (None, 7),
+    (2, 7),
+    (1, 4),
+    (0, -15),
+])
+def test_band_narrow(band, expected):
+    # the best alignment shifts the right sequence by 2 elements
+    left = 'ATCATCATCATCATGGG'
+    right = left[2:] + 'AT'
+    alg = ALG(gap_cost=2, sim_func=sim_ident, band=band)
+    assert alg._pure_python(left, right) == expected
+    pytest.importorskip('numpy')
+    assert alg._numpy(left, right) == expected
+
+
+def test_band_negative():
+    with pytest.raises(ValueError):
+        ALG(band=-1)
+
+
+@pytest.mark.parametrize('left, right, expected', [
+    ('GATTACA', 'GCATGCU', ('GATTACA', 'GCATGCU')),
+    ('test', 'tesst', ('tes-t', 'tesst')),
+    ('', 'abc', ('---', 'abc')),
+    ('abc', '', ('abc', '---')),
+    ('', '', ('', '')),
+])
+def test_align(left, right, expected):
+    assert ALG().align(left, right) == expected
+
+
+def test_align_lists():
+    actual = ALG().align([1, 2, 3], [1, 3], gap=None)
+    assert actual == ([1, 2, 3], [1, None, 3])
+
+
+@pytest.mark.parametrize('left, right', [
+    ('AGACTAGTTAC', 'CGAGACGT'),
+    ('CGATATCAG', 'TGACGSTGC'),
+    ('AGACTAGTTACCGATATCAGGATTACA', 'CGAGACGTTGACGSTGCGCATGCU'),
+])
+def test_align_score(left, right):
+    sim_matrix = textdistance.Matrix(NW_MATRIX, symmetric=True)
+    alg = ALG(gap_cost=3, sim_func=sim_matrix)
+    aligned1, aligned2 = alg.align(left, right)
+    assert aligned1.replace('-', '') == left
+    assert aligned2.replace('-', '') == right
+    score = sum(-3 if '-' in pair else sim_matrix(*pair) for pair in zip(aligned1, aligned2))
+    assert score == alg(left, right)
+
+
+def test_opcodes():
+    actual = ALG().opcodes('test', 'tesst')
+    assert actual == [('equal', 0, 3, 0, 3), ('insert', 3, 3, 3, 4), ('equal', 3, 4, 4, 5)]
@@ -53,3 +53,203 @@ def test_distance_ident(left, right, expected):
 def test_distance_ident_with_gap_5(left, right, expected):
     actual = ALG(gap_cost=5, sim_func=sim_ident)(left, right)
     assert actual == expected
+
+
+@pytest.mark.parametrize('left, right, expected', [
+    ('AGACTAGTTAC', 'CGAGACGT', 26),
+    ('GATTACA', '', 0),
+    ('', '', 0),
+])
+def test_numpy(left, right, expected):
+    pytest.importorskip('numpy')
+    sim_matrix = textdistance.Matrix(NW_MATRIX, symmetric=True)
+    actual = ALG(gap_cost=5, sim_func=sim_matrix)._numpy(left, right)
+    assert actual == expected
+    assert type(actual) is float
+
+
+@pytest.mark.parametrize('left, right', [
+    ('AGACTAGTTACCGATATCAGGATTACA', 'CGAGACGTTGACGSTGCGCATGCU'),
+    ('GATTACA' * 5, 'GCATGCU' * 4),
+])
+def test_distance_long(left, right):
+    alg = ALG(gap_cost=1, sim_func=sim_ident)
+    # unhashable elements fall back to the scalar implementation
+    expected = alg([[c] for c in left], [[c] for c in right])
+    assert alg(left, right) == expected
+
+
+@pytest.mark.parametrize('left, right', [
+    ('AGACTAGTTAC', 'CGAGACGT'),
+    ('AGACTAGTTACCGATATCAGGATTACA', 'CGAGACGTTGACGTGCGCATGCT'),
+])
+def test_sim_matrix(left, right):
+    sim_matrix = textdistance.Matrix(NW_MATRIX, symmetric=True)
+    expected = ALG(gap_cost=5, sim_func=sim_matrix)(left, right)
+    assert ALG(gap_cost=5, sim_matrix=NW_MATRIX)(left, right) == expected
+
+
+@pytest.mark.parametrize('left, right, expected', [
+    ('AGACTAGTTAC', 'CGAGACGT', 26),
+    ('GATTACA', '', 0),
+    ('', '', 0),
+])
+def test_pure_python(left, right, expected):
+    sim_matrix = textdistance.Matrix(NW_MATRIX, symmetric=True)
+    actual = ALG(gap_cost=5, sim_func=sim_matrix)._pure_python(left, right)
+    assert actual == expected
+
+
+@pytest.mark.parametrize('left, right, expected', [
+    ('xxxGATTACAyy', 'zzGATCACAww', ('GATTACA', 'GATCACA')),
+    ('GATTACA', 'xyz', ('', '')),
+    ('', '', ('', '')),
+])
+def test_align(left, right, expected):
+    assert ALG().align(left, right) == expected
+
+
+def test_opcodes():
+    actual = ALG().opcodes('xxxGATTACAyy', 'zzGATCACAww')
+    assert actual == [('equal', 3, 6, 2, 5), ('replace', 6, 7, 5, 6), ('equal', 7, 10, 6, 9)]
+
+
+def test_top_alignments():
+    # the passage is repeated twice in the first sequence
+    left = 'xxGATTACAyyyyGATTACAzz'
+    right = 'wGATTACAw'
+    actual = ALG().top_alignments(left, right, 2)
+    assert actual == [
+        (7, [('equal', 2, 9, 1, 8)]),
+        (7, [('equal', 13, 20, 1, 8)]),
+    ]
+
+
+@pytest.mark.parametrize('left, right', [
+    ('AGACTAGTTACCGATATCAGGATTACA', 'CGAGACGTTGACGSTGCGCATGCU'),
+    ('GATTACA' * 5, 'GCATGCU' * 4),
+])
+def test_top_alignments_scores(left, right):
+    sim_matrix = textdistance.Matrix(NW_MATRIX, symmetric=True)
+    alg = ALG(gap_cost=5, sim_func=sim_matrix)
+    alignments = alg.top_alignments(left, right, 5)
+    scores = [score for score, _ in alignments]
+    assert scores[0] == alg._best_cell(left, right)[0]
+    assert scores == sorted(scores, reverse=True)
+
+    # alignments don't share aligned pairs
+    pairs = [
+        (i1 + k, j1 + k)
+        for _, opcodes in alignments
+        for tag, i1, i2, j1, _ in opcodes if tag in ('equal', 'replace')
+        for k in range(i2 - i1)
+    ]
+    assert len(pairs) == len(set(pairs))
+
+
+def test_top_alignments_empty():
+    assert ALG().top_alignments('abc', 'xyz', 3) == []
+    assert ALG().top_alignments('abc', 'abc', 0) == []
+
+
+def _penalized(e1, e2):
+    return 1 if e1 == e2 else -3
+
+
+def test_extend():
+    core = 'GATTACACATGCATTAGGACA'
+    left = 'ttttttttttttttttttttt' + core + 'cccccccccccc'
+    right = 'aaaaaaa' + core + 'gggggggggggggggggg'
+    alg = ALG(gap_cost=4, sim_func=_penalized)
+    # the seed is in the middle of the common passage
+    actual = alg.extend(left, right, 21 + 5, 7 + 5, xdrop=10)
+    assert actual == (len(core), 21, 21 + len(core), 7, 7 + len(core))
+
+
+def test_extend_gap():
+    alg = ALG(gap_cost=2, sim_func=_penalized)
+    # the gap costs less than the drop
+    assert alg.extend('xxGATTACAxx', 'yyGATACAyy', 2, 2, xdrop=5) == (4, 2, 9, 2, 8)
+    # the gap costs more than the drop, the extension stops before it
+    assert alg.extend('xxGATTACAxx', 'yyGATACAyy', 2, 2, xdrop=1) == (3, 2, 5, 2, 5)
+
+
+@pytest.mark.parametrize('left, right', [
+    ('AGACTAGTTACCGATATCAGGATTACA', 'CGAGACGTTGACGSTGCGCATGCU'),
+    ('GATTACA', 'GCATGCU'),
+    ('', 'GATTACA'),
+])
+def test_extend_unlimited(left, right):
+    # without dropping, the seed at the start gives the best prefix alignment
+    alg = ALG(gap_cost=1, sim_func=_penalized)
+    score, i1, i2, j1, j2 = alg.extend(left, right, 0, 0, xdrop=float('inf'))
+    assert (i1, j1) == (0, 0)
+    expected = max(
+        textdistance.NeedlemanWunsch(gap_cost=1, sim_func=_penalized)(left[:i], right[:j])
+        for i in range(len(left) + 1)
+        for j in range(len(right) + 1)
+    )
+    assert score == expected
+
+
+def test_index_search():
+    documents = [
+        'the quick brown fox jumps over the lazy dog',
+        'a quick brown dog jumps over the lazy fox',
+        'lorem ipsum dolor sit amet',
+    ]
+    index = textdistance.SmithWatermanIndex(documents, k=4, algorithm=ALG(gap_cost=4, sim_func=_penalized))
+    assert len(index) == 3
+    hits = index.search('jumps over the lazy cat')
+    assert [hit[1] for hit in hits] == [0, 1]
+    score, _, i1, i2, j1, j2 = hits[0]
+    assert score == 20
+    assert (i1, i2) == (0, 20)
+    assert documents[0][j1:j2] == 'jumps over the lazy '
+    assert index.search('jumps over the lazy cat', n=1) == hits[:1]
+    assert index.search('xyz') == []
+
+
+@pytest.mark.parametrize('left, right', [
+    ('AGACTAGTTACCGATATCAGGATTACA', 'CGAGACGTTGACGSTGCGCATGCU'),
+    ('xxGATTACAyyy', 'zzzzzGATTACAww'),
+    ('GATTACA', 'GCATGCU'),
+])
+def test_index_search_full(left, right):
+    # with the band wider than the sequences, it is Smith-Waterman
+    alg = ALG(gap_cost=1, sim_func=_penalized)
+    index = textdistance.SmithWatermanIndex([right], k=1, algorithm=alg)
+    score, _, i1, i2, j1, j2 = index.search(left, band=len(left) + len(right))[0]
+    assert score == alg._best_cell(left, right)[0]
+    nw = textdistance.NeedlemanWunsch(gap_cost=1, sim_func=_penalized)
+    assert nw(left[i1:i2], right[j1:j2]) == score
+
+
+def test_index_min_seeds():
+    index = textdistance.SmithWatermanIndex(['xxGATTACAyy', 'zzGATTzz'], k=3)
+    assert [hit[1] for hit in index.search('GATTACA')] == [0, 1]
+    # 'GATTACA' has 5 q-grams in the first document and 2 in the second
+    assert [hit[1] for hit in index.search('GATTACA', min_seeds=3)] == [0]
+
+
+def test_index_errors():
+    with pytest.raises(ValueError):
+        textdistance.SmithWatermanIndex(['test'], k=0)
+    with pytest.raises(ValueError):
+        textdistance.SmithWatermanIndex(['test']).search('test', band=-1)
+
+
+@pytest.mark.parametrize('i, j, xdrop', [
+    (10, 10, 5),
+    (-1, 0, 5),
+    (0, 4, 5),
+    (1, 1, -1),
+])
+def test_extend_errors(i, j, xdrop):
+    with pytest.raises(ValueError):
+        ALG().extend('abc', 'abc', i, j, xdrop)
+
+
+def test_extend_bounds():
+    assert ALG().extend('abc', 'abc', 3, 3, 0) == (3, 0, 3, 0, 3)
+    assert ALG().extend('abc', 'abc', 0, 0, 0) == (3, 0, 3, 0, 3)
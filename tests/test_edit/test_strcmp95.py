@@ -16,6 +16,11 @@ ALG = textdistance.StrCmp95
     ('DWAYNE', 'DUANE', 0.873),
     ('DIXON', 'DICKSONX', 0.839333333),
     ('TEST', 'TEXT', 0.9066666666666666),
+
+    # similar characters
+    ('B0B', 'BOB', 0.86),
+    ('ELENA', 'ALINA', 0.8133333333333334),
+    ('MONICA', 'NOMIKA', 0.8555555555555555),
 ])
 def test_distance(left, right, expected):
     actual = ALG(external=False)(left, right)
@@ -23,3 +28,16 @@ def test_distance(left, right, expected):
 
     actual = ALG(external=True)(left, right)
     assert isclose(actual, expected)
+
+
+class CustomStrCmp95(ALG):
+    sp_mx = (('T', 'X'),)
+
+
+@pytest.mark.parametrize('left, right, expected', [
+    ('TEST', 'TEXT', 0.8666666666666667),
+    ('TESTING', 'TEXTONG', 0.8476190476190477),
+])
+def test_custom_similar_chars(left, right, expected):
+    actual = CustomStrCmp95(external=False)(left, right)
+    assert isclose(actual, expected)
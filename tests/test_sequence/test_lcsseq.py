@@ -19,6 +19,9 @@ ALG = textdistance.LCSSeq
 
     ('a' * 80, 'a' * 80, 'a' * 80),
     ('a' * 80, 'b' * 80, ''),
+
+    ('abcab', 'abab', 'abab'),
+    ('Baker Street 221b', 'Baker st. 221b', 'Baker t 221b'),
 ])
 def test_distance(left, right, expected):
     actual = ALG(external=False)(left, right)
@@ -39,3 +42,39 @@ def test_distance_multiseq(seqs, expected):
 
     actual = ALG(external=True)(*seqs)
     assert actual == expected
+
+
+@pytest.mark.parametrize('left, right', [
+    ('ab', 'cd'),
+    ('test', 'text'),
+    ('thisisatest', 'testing123testing'),
+    ('DIXON', 'DICKSONX'),
+    ('random exponential', 'layer activation'),
+    ('a' * 80, 'b' * 80),
+    ('Baker Street 221b', 'Baker st. 221b'),
+    ('', 'test'),
+])
+def test_similarity(left, right):
+    expected = len(ALG()._dynamic(left, right))
+    assert ALG().similarity(left, right) == expected
+    assert ALG()._bit_parallel(left, right) == expected
+    assert ALG()._bit_parallel(right, left) == expected
+    assert ALG().similarity(list(left), list(right)) == expected
+
+
+def test_similarity_long():
+    left = 'GATTACA' * 300
+    right = 'GCATGCU' * 300
+    # precomputed with `_dynamic`
+    assert ALG().similarity(left, right) == 1200
+    assert ALG().distance(left, right) == 2100 - 1200
+
+
+def test_words():
+    assert ALG(qval=None)('a b c', 'a x c') == 'ac'
+    assert ALG(qval=None).similarity('a b c', 'a x c') == 2
+
+
+def test_same_subsequence():
+    # skipping the common affix doesn't change which LCS is found
+    assert ALG()('babaab', 'ababb') == 'abab'
@@ -3,7 +3,9 @@ from __future__ import annotations
 # built-in
 from collections import Counter
 from contextlib import suppress
-from typing import Sequence, TypeVar
+from functools import partial
+from math import ceil
+from typing import Callable, Sequence, TypeVar
 
 # app
 from ..libraries import prototype
@@ -29,10 +31,15 @@ class Base:
         """
         return max(map(len, sequences))
 
-    def distance(self, *sequences: Sequence[object]) -> float:
+    def distance(self, *sequences: Sequence[object], max_distance: float | None = None) -> float:
         """Get distance between sequences
+
+        If the distance is greater than `max_distance`, `max_distance + 1` is returned.
         """
-        return self(*sequences)
+        distance = self(*sequences)
+        if max_distance is not None and distance > max_distance:
+            return max_distance + 1
+        return distance
 
     def similarity(self, *sequences: Sequence[object]) -> float:
         """Get sequences similarity.
@@ -41,20 +48,36 @@ class Base:
         """
         return self.maximum(*sequences) - self.distance(*sequences)
 
-    def normalized_distance(self, *sequences: Sequence[object]) -> float:
+    def normalized_distance(self, *sequences: Sequence[object], max_distance: float | None = None) -> float:
         """Get distance from 0 to 1
+
+        If the normalized distance is greater than `max_distance`, 1 is returned.
         """
         maximum = self.maximum(*sequences)
         if maximum == 0:
             return 0
-        return self.distance(*sequences) / maximum
+        if max_distance is None:
+            return self.distance(*sequences) / maximum
+        distance = self.distance(*sequences, max_distance=ceil(max_distance * maximum))
+        if distance / maximum > max_distance:
+            return 1
+        return distance / maximum
 
-    def normalized_similarity(self, *sequences: Sequence[object]) -> float:
+    def normalized_similarity(self, *sequences: Sequence[object], max_distance: float | None = None) -> float:
         """Get similarity from 0 to 1
 
         normalized_similarity = 1 - normalized_distance
         """
-        return 1 - self.normalized_distance(*sequences)
+        return 1 - self.normalized_distance(*sequences, max_distance=max_distance)
+
+    def compile(self, query: Sequence[object]) -> Callable[..., float]:
+        """Prepare `query` for comparing with many other sequences.
+
+        Returns a function that takes a sequence and returns the same value
+        as the algorithm called with `query` and this sequence.
+        Algorithms override it to do the query-side preparation only once.
+        """
+        return partial(self, query)
 
     def external_answer(self, *sequences: Sequence[object]) -> float | None:
         """Try to get answer from known external libraries.
@@ -130,6 +153,45 @@ class Base:
         # by n-grams
         return [find_ngrams(s, self.qval) for s in sequences]
 
+    @staticmethod
+    def _common_affix(
+        s1: Sequence[T],
+        s2: Sequence[T],
+        test_func: Callable[[T, T], bool] | None = None,
+    ) -> tuple[int, int]:
+        """Get lengths of the common prefix and the common suffix of two sequences.
+
+        The suffix is searched only in what is left after the prefix,
+        so `s1[prefix:len(s1) - suffix]` is never negative-sized.
+        DP-based algorithms use it to skip the parts of near-duplicates
+        that they would match anyway.
+        """
+        size = min(len(s1), len(s2))
+        prefix = 0
+        suffix = 0
+        if test_func is None or test_func is Base._ident:
+            while prefix < size and s1[prefix] == s2[prefix]:
+                prefix += 1
+            while suffix < size - prefix and s1[-1 - suffix] == s2[-1 - suffix]:
+                suffix += 1
+        else:
+            while prefix < size and test_func(s1[prefix], s2[prefix]):
+                prefix += 1
+            while suffix < size - prefix and test_func(s1[-1 - suffix], s2[-1 - suffix]):
+                suffix += 1
+        return prefix, suffix
+
+    @staticmethod
+    def _get_masks(sequence: Sequence[T]) -> dict[T, int]:
+        """Map every element to the bit mask of its positions in the sequence.
+
+        Used by bit-parallel algorithms. Elements must be hashable.
+        """
+        masks: dict[T, int] = {}
+        for i, element in enumerate(sequence):
+            masks[element] = masks.get(element, 0) | 1 << i
+        return masks
+
     def _get_counters(self, *sequences: Sequence[object]) -> list[Counter]:
         """Prepare sequences and convert it to Counters.
         """
@@ -138,6 +200,15 @@ class Base:
             return list(sequences)  # type: ignore[arg-type]
         return [Counter(s) for s in self._get_sequences(*sequences)]
 
+    def _compile_counters(self, query: Sequence[object]) -> Callable[[Sequence[object]], float]:
+        """Implementation of `compile` for algorithms working on Counters.
+        """
+        counter = self._get_counters(query)[0]
+
+        def compiled(sequence: Sequence[object]) -> float:
+            return self(counter, *self._get_counters(sequence))  # type: ignore[arg-type]
+        return compiled
+
     def _intersect_counters(self, *sequences: Counter[T]) -> Counter[T]:
         intersection = sequences[0].copy()
         for s in sequences[1:]:
@@ -165,15 +236,20 @@ class Base:
             return sum(counter.values())
 
     def __repr__(self) -> str:
+        # private attributes are internal tables prepared from the parameters
+        data = {name: value for name, value in self.__dict__.items() if not name.startswith('_')}
         return '{name}({data})'.format(
             name=type(self).__name__,
-            data=self.__dict__,
+            data=data,
         )
 
 
 class BaseSimilarity(Base):
-    def distance(self, *sequences: Sequence[object]) -> float:
-        return self.maximum(*sequences) - self.similarity(*sequences)
+    def distance(self, *sequences: Sequence[object], max_distance: float | None = None) -> float:
+        distance = self.maximum(*sequences) - self.similarity(*sequences)
+        if max_distance is not None and distance > max_distance:
+            return max_distance + 1
+        return distance
 
     def similarity(self, *sequences: Sequence[object]) -> float:
         return self(*sequences)
@@ -1,12 +1,17 @@
 from __future__ import annotations
 
 # built-in
-from collections import defaultdict
-from itertools import zip_longest
-from typing import Any, Sequence, TypeVar
+from collections import Counter, defaultdict, deque
+from contextlib import suppress
+from functools import lru_cache
+from itertools import combinations, zip_longest
+from math import comb
+from typing import Any, Callable, Iterable, Iterator, Mapping, Sequence, TypeVar
 
 # app
+from ..utils import find_ngrams
 from .base import Base as _Base, BaseSimilarity as _BaseSimilarity
+from .simple import Matrix as _Matrix
 from .types import SimFunc, TestFunc
 
 
@@ -18,10 +23,10 @@ except ImportError:
 
 
 __all__ = [
-    'Hamming', 'MLIPNS',
+    'Hamming', 'HammingIndex', 'MLIPNS',
     'Levenshtein', 'DamerauLevenshtein',
     'Jaro', 'JaroWinkler', 'StrCmp95',
-    'NeedlemanWunsch', 'Gotoh', 'SmithWaterman',
+    'NeedlemanWunsch', 'Gotoh', 'SmithWaterman', 'SmithWatermanIndex',
 
     'hamming', 'mlipns',
     'levenshtein', 'damerau_levenshtein',
@@ -29,6 +34,179 @@ __all__ = [
     'needleman_wunsch', 'gotoh', 'smith_waterman',
 ]
 T = TypeVar('T')
+# for shorter anti-diagonals on average the numpy overhead outweighs the gain
+_WAVEFRONT_MIN_DIAGONAL = 12
+# the weighted Levenshtein wavefront does more work for every diagonal
+_WEIGHTED_WAVEFRONT_MIN_DIAGONAL = 100
+
+
+def _compile_sim_matrix(
+    sim_matrix: Any,
+    alphabet: Iterable[Any] | None = None,
+) -> tuple[dict[Any, int], list[list[float]]]:
+    """Compile a substitution matrix into ids of the alphabet and a dense score table.
+
+    `sim_matrix` is a `Matrix`, a mapping of pairs of elements to scores
+    (the same as `Matrix.mat`), or a square 2-D array (numpy or nested lists)
+    indexed by positions of elements in `alphabet`.
+    For a `Matrix` and a mapping the alphabet defaults to all elements of the pairs.
+    """
+    if isinstance(sim_matrix, Mapping):
+        sim_matrix = _Matrix(sim_matrix)
+    if alphabet is None:
+        if not isinstance(sim_matrix, _Matrix):
+            raise ValueError('alphabet is required for an array sim_matrix')
+        alphabet = dict.fromkeys(c for pair in sim_matrix.mat or () for c in pair)
+    alphabet = list(alphabet)
+    ids = {c: i for i, c in enumerate(alphabet)}
+    if not ids:
+        raise ValueError('alphabet is empty')
+    if len(ids) != len(alphabet):
+        raise ValueError('alphabet has duplicate elements')
+
+    if isinstance(sim_matrix, _Matrix):
+        return ids, [[float(sim_matrix(c1, c2)) for c2 in alphabet] for c1 in alphabet]
+    rows = [[float(score) for score in row] for row in sim_matrix]
+    if len(rows) != len(ids) or any(len(row) != len(ids) for row in rows):
+        raise ValueError('sim_matrix must be a square matrix of the alphabet size')
+    return ids, rows
+
+
+def _scoring(
+    sim_func: SimFunc,
+    sim_matrix: Any,
+    alphabet: Iterable[Any] | None,
+) -> tuple[SimFunc, dict[Any, int] | None, list[list[float]] | None]:
+    """Resolve scoring parameters of alignment algorithms.
+
+    Returns `sim_func` and, if `sim_matrix` is passed, ids of the alphabet
+    and the compiled score table. In this case `sim_func` looks up the table.
+    """
+    if sim_matrix is None:
+        return sim_func, None, None
+    if sim_func:
+        raise ValueError('sim_func and sim_matrix are mutually exclusive')
+    ids, rows = _compile_sim_matrix(sim_matrix, alphabet)
+
+    def lookup(c1: Any, c2: Any) -> float:
+        try:
+            return rows[ids[c1]][ids[c2]]
+        except KeyError as exc:
+            raise ValueError('{!r} is not in the alphabet'.format(exc.args[0])) from None
+    return lookup, ids, rows
+
+
+def _score_table(
+    s1: Sequence[T],
+    s2: Sequence[T],
+    sim_func: Callable[[T, T], float],
+    alphabet: Mapping[T, int] | None = None,
+    rows: list[list[float]] | None = None,
+    dtype: Any = float,
+) -> tuple[Any, Any, Any]:
+    """Encode sequences into ids of their elements and score all pairs of ids.
+
+    `sim_func` is called once for every pair of distinct elements
+    instead of every cell of the matrix. If `alphabet` ids and score `rows`
+    are passed (see `_compile_sim_matrix`), they are used as is.
+    The second sequence is reversed, so its part of every anti-diagonal
+    is a slice, see `_anti_diagonals`. Elements must be hashable.
+    """
+    if alphabet is not None:
+        try:
+            codes1 = numpy.array([alphabet[c] for c in s1], dtype=numpy.intp)
+            codes2 = numpy.array([alphabet[c] for c in reversed(s2)], dtype=numpy.intp)
+        except KeyError as exc:
+            raise ValueError('{!r} is not in the alphabet'.format(exc.args[0])) from None
+        return codes1, codes2, numpy.array(rows, dtype=dtype)
+
+    ids1: dict[T, int] = {}
+    ids2: dict[T, int] = {}
+    codes1 = numpy.array([ids1.setdefault(c, len(ids1)) for c in s1], dtype=numpy.intp)
+    codes2 = numpy.array([ids2.setdefault(c, len(ids2)) for c in reversed(s2)], dtype=numpy.intp)
+    scores = [sim_func(c1, c2) for c1 in ids1 for c2 in ids2]
+    table = numpy.array(scores, dtype=dtype).reshape(len(ids1), len(ids2))
+    return codes1, codes2, table
+
+
+def _band_limits(len1: int, len2: int, band: int | None) -> tuple[int, int]:
+    """Get the lowest and the highest `j - i` of the cells in the band.
+
+    The band goes along the main diagonal and is widened by the length difference,
+    so the last cell of the matrix is always in it. No band covers the whole matrix.
+    """
+    if band is None:
+        return -len1, len2
+    diff = len2 - len1
+    return min(0, diff) - band, max(0, diff) + band
+
+
+def _use_wavefront(
+    len1: int,
+    len2: int,
+    band: int | None = None,
+    min_diagonal: int = _WAVEFRONT_MIN_DIAGONAL,
+) -> bool:
+    """Check if the numpy wavefront is faster than the pure Python rows.
+    """
+    if not numpy:
+        return False
+    lo, hi = _band_limits(len1, len2, band)
+    cells = len1 * min(len2, hi - lo + 1)
+    return cells >= min_diagonal * (len1 + len2)
+
+
+def _anti_diagonals(
+    len1: int,
+    len2: int,
+    band: int | None = None,
+) -> Iterator[tuple[int, slice, slice, slice]]:
+    """Walk anti-diagonals of the matrix for sequences of the given lengths.
+
+    Anti-diagonals are stored in arrays indexed by the row number `i`.
+    For every diagonal `d = i + j` yields `d`, the slice of its inner cells
+    (`i` and `j` are not 0) in the band, and the slices of the first sequence
+    and of the reversed second sequence for these cells.
+    The inner cell `(i, j)` depends on `i - 1` of the previous diagonal for `(i - 1, j)`,
+    `i` of the previous diagonal for `(i, j - 1)`,
+    and `i - 1` of the diagonal before it for `(i - 1, j - 1)`.
+    So the band only needs the cells right before and after its slice
+    to be out of the alignment.
+    """
+    lo, hi = _band_limits(len1, len2, band)
+    for d in range(1, len1 + len2 + 1):
+        low = max(1, d - len2, -((hi - d) // 2))
+        high = max(low - 1, min(len1, d - 1, (d - lo) // 2))
+        yield d, slice(low, high + 1), slice(low - 1, high), slice(len2 - d + low, len2 - d + high + 1)
+
+
+def _opcodes(steps: list[tuple[str, int, int]]) -> list[tuple[str, int, int, int, int]]:
+    """Merge alignment steps into `difflib.SequenceMatcher.get_opcodes`-like runs.
+    """
+    opcodes: list[tuple[str, int, int, int, int]] = []
+    for tag, i, j in steps:
+        i2 = i if tag == 'insert' else i + 1
+        j2 = j if tag == 'delete' else j + 1
+        if opcodes and opcodes[-1][0] == tag:
+            opcodes[-1] = (tag, opcodes[-1][1], i2, opcodes[-1][3], j2)
+        else:
+            opcodes.append((tag, i, i2, j, j2))
+    return opcodes
+
+
+def _aligned(
+    s1: Sequence[T],
+    s2: Sequence[T],
+    steps: list[tuple[str, int, int]],
+    gap: Any,
+) -> tuple[Sequence[Any], Sequence[Any]]:
+    """Get both sequences of the alignment with `gap` in place of the missed elements.
+    """
+    aligned1: list[Any] = [gap if tag == 'insert' else s1[i] for tag, i, _ in steps]
+    aligned2: list[Any] = [gap if tag == 'delete' else s2[j] for tag, _, j in steps]
+    if isinstance(s1, str) and isinstance(s2, str):
+        return ''.join(aligned1), ''.join(aligned2)
+    return aligned1, aligned2
 
 
 class Hamming(_Base):
@@ -36,6 +214,11 @@ class Hamming(_Base):
     Compute the Hamming distance between the two or more sequences.
     The Hamming distance is the number of differing items in ordered sequences.
 
+    Two `bytes`, `bytearray`, or 1-D numpy arrays are compared at once
+    by XOR of the packed data. If `bits=True`, differing bits are counted
+    instead of differing items, which is the distance between binary codes
+    like fingerprints and perceptual hashes. It supports only such sequences.
+
     https://en.wikipedia.org/wiki/Hamming_distance
     """
 
@@ -45,15 +228,90 @@ class Hamming(_Base):
         test_func: TestFunc | None = None,
         truncate: bool = False,
         external: bool = True,
+        bits: bool = False,
     ) -> None:
         self.qval = qval
         self.test_func = test_func or self._ident
         self.truncate = truncate
         self.external = external
+        self.bits = bits
+
+    def maximum(self, *sequences: Sequence[object]) -> int:
+        if not self.bits:
+            return max(map(len, sequences))
+        return max(len(s) * self._item_bits(s) for s in sequences)
+
+    @staticmethod
+    def _item_bits(sequence: Sequence[object]) -> int:
+        if numpy is not None and isinstance(sequence, numpy.ndarray):
+            return sequence.itemsize * 8
+        return 8
+
+    @staticmethod
+    def _is_bytes(sequence: Sequence[object]) -> bool:
+        if isinstance(sequence, memoryview):
+            return sequence.itemsize == 1
+        return isinstance(sequence, (bytes, bytearray))
+
+    def _bytes(self, s1: bytes, s2: bytes) -> int:
+        """
+        XOR of two byte strings converted into ints, so all bytes are compared at once.
+        """
+        size = min(len(s1), len(s2))
+        diff = int.from_bytes(s1[:size], 'little') ^ int.from_bytes(s2[:size], 'little')
+        if not self.bits:
+            # fold every byte into its lowest bit
+            diff |= diff >> 4
+            diff |= diff >> 2
+            diff |= diff >> 1
+            diff &= int.from_bytes(b'\x01' * size, 'little')
+        return bin(diff).count('1')
+
+    def _numpy(self, s1: numpy.ndarray, s2: numpy.ndarray) -> Any:
+        """
+        Distances between the rows of `s1` and `s2` along the last axis.
+        """
+        size = min(s1.shape[-1], s2.shape[-1])
+        s1 = s1[..., :size]
+        s2 = s2[..., :size]
+        if not self.bits:
+            return numpy.count_nonzero(s1 != s2, axis=-1)
+        diff = numpy.bitwise_xor(s1, s2)
+        if hasattr(numpy, 'bitwise_count'):
+            return numpy.bitwise_count(diff).sum(axis=-1, dtype=int)
+        # numpy < 2.0
+        diff = numpy.ascontiguousarray(diff).view(numpy.uint8)
+        return numpy.unpackbits(diff, axis=-1).sum(axis=-1, dtype=int)
+
+    def _packed(self, s1: Sequence[object], s2: Sequence[object]) -> int | None:
+        """
+        Compare two byte strings or two 1-D numpy arrays at once.
+        Returns None for other sequences.
+        """
+        if self._is_bytes(s1) and self._is_bytes(s2):
+            dist = self._bytes(s1, s2)  # type: ignore[arg-type]
+        elif numpy is not None and isinstance(s1, numpy.ndarray) and isinstance(s2, numpy.ndarray):
+            if s1.ndim != 1 or s2.ndim != 1:
+                return None
+            dist = int(self._numpy(s1, s2))
+        else:
+            return None
+        if not self.truncate:
+            # missing items differ in all bits
+            longest = max(s1, s2, key=len)
+            dist += (len(longest) - min(len(s1), len(s2))) * (self._item_bits(longest) if self.bits else 1)
+        return dist
 
     def __call__(self, *sequences: Sequence[object]) -> int:
         sequences = self._get_sequences(*sequences)
 
+        if len(sequences) == 2 and self.qval == 1 and self.test_func is self._ident:
+            result = self._packed(*sequences)
+            if result is not None:
+                return result
+        if self.bits:
+            raise TypeError('bits=True supports only two byte strings or two 1-D numpy arrays')
+
         result = self.quick_answer(*sequences)
         if result is not None:
             assert isinstance(result, int)
@@ -62,6 +320,164 @@ class Hamming(_Base):
         _zip = zip if self.truncate else zip_longest
         return sum(not self.test_func(*es) for es in _zip(*sequences))
 
+    def _query_array(self, query: Sequence[object], codes: numpy.ndarray) -> numpy.ndarray:
+        """Convert `query` to a numpy array comparable with the rows of `codes`.
+        """
+        if isinstance(query, numpy.ndarray):
+            return query
+        if self._is_bytes(query):
+            return numpy.frombuffer(query, dtype=codes.dtype)  # type: ignore[call-overload]
+        # `numpy.asarray` makes a 0-d array from a string
+        return numpy.asarray(list(query))
+
+    def batch(self, query: Sequence[object], codes: Iterable[Sequence[object]]) -> Any:
+        """Get distances from `query` to every code in `codes`.
+
+        If `codes` is a 2-D numpy array with a code in every row,
+        all distances are calculated at once and returned as a numpy array.
+        If `query` is a 2-D array too, it is compared with `codes` row by row.
+        Otherwise, a list is returned.
+        """
+        vectorized = self.qval == 1 and self.test_func is self._ident
+        if numpy is None or not isinstance(codes, numpy.ndarray) or codes.ndim != 2 or not vectorized:
+            return [self(query, code) for code in codes]
+        query = self._query_array(query, codes)
+        dist = self._numpy(codes, query)
+        if not self.truncate:
+            item_bits = codes.itemsize * 8 if self.bits else 1
+            dist += abs(codes.shape[1] - query.shape[-1]) * item_bits
+        return dist
+
+
+class HammingIndex:
+    """
+    Index of equal-length codes for search by the Hamming distance.
+
+    It uses multi-index hashing: every code is split into `chunks` parts,
+    and every part goes into its own hash table. If two codes are within
+    distance `r`, at least one pair of their parts is within `r // chunks`,
+    so only codes sharing such a part with the query are compared.
+    With `bits=True`, the parts are looked up with all bit flips within
+    that distance. Otherwise, parts can be looked up only as is,
+    so radiuses not less than `chunks` fall back to comparing with every code.
+
+    https://www.cs.toronto.edu/~norouzi/research/papers/multi_index_hashing.pdf
+    """
+
+    def __init__(self, codes: Iterable[Sequence[object]], chunks: int = 4, bits: bool = False) -> None:
+        self.codes = list(codes)
+        self.chunks = chunks
+        self.bits = bits
+        self.hamming = Hamming(bits=bits)
+        if chunks < 1:
+            raise ValueError('chunks must be positive')
+
+        self._ints = [self._to_int(code) for code in self.codes] if bits else []
+        sizes = {self._size(code) for code in self.codes}
+        if len(sizes) > 1:
+            raise ValueError('codes must have the same length')
+        self.size = sizes.pop() if sizes else 0
+        bounds = [self.size * i // chunks for i in range(chunks + 1)]
+        self._spans = list(zip(bounds, bounds[1:]))
+
+        self._tables: list[dict[Any, list[int]]] = [defaultdict(list) for _ in range(chunks)]
+        for i, code in enumerate(self.codes):
+            for table, part in zip(self._tables, self._split(code)):
+                table[part].append(i)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    @staticmethod
+    def _to_int(code: Sequence[object]) -> int:
+        if numpy is not None and isinstance(code, numpy.ndarray):
+            return int.from_bytes(code.tobytes(), 'little')
+        return int.from_bytes(code, 'little')  # type: ignore[arg-type]
+
+    def _size(self, code: Sequence[object]) -> int:
+        if self.bits:
+            return len(code) * self.hamming._item_bits(code)
+        return len(code)
+
+    def _split(self, code: Sequence[object]) -> list[Any]:
+        if self.bits:
+            value = self._to_int(code)
+            return [(value >> low) & ((1 << (high - low)) - 1) for low, high in self._spans]
+        if numpy is not None and isinstance(code, numpy.ndarray):
+            return [code[low:high].tobytes() for low, high in self._spans]
+        if isinstance(code, list):
+            return [tuple(code[low:high]) for low, high in self._spans]
+        return [code[low:high] for low, high in self._spans]
+
+    def _distance(self, query: Sequence[object], query_int: int, i: int) -> int:
+        if self.bits:
+            return bin(query_int ^ self._ints[i]).count('1')
+        return self.hamming(query, self.codes[i])
+
+    def _candidates(self, parts: list[Any], radius: int) -> Iterator[int]:
+        """Indices of codes with a part exactly at `radius` from the query part.
+        """
+        for table, part, (low, high) in zip(self._tables, parts, self._spans):
+            for flipped in combinations(range(high - low), radius):
+                key = part
+                for bit in flipped:
+                    key ^= 1 << bit
+                yield from table.get(key, ())
+
+    def _search(self, query: Sequence[object], done: Callable[[int, dict[int, int]], bool]) -> dict[int, int]:
+        """Get distances to codes found for the growing radius until `done` is true.
+
+        `done` is called with the radius `r` and the distances found so far,
+        all codes within `r` are found by then.
+        """
+        if self.codes and self._size(query) != self.size:
+            raise ValueError('query must have the same length as codes')
+        query_int = self._to_int(query) if self.bits else 0
+        parts = self._split(query)
+        found: dict[int, int] = {}
+        for radius in range(max(high - low for low, high in self._spans) + 1):
+            if self.bits:
+                # looking up all bit flips becomes slower than comparing with every code
+                if sum(comb(high - low, radius) for low, high in self._spans) > len(self.codes):
+                    break
+                candidates: Iterable[int] = self._candidates(parts, radius)
+            elif radius == 0:
+                candidates = (i for table, part in zip(self._tables, parts) for i in table.get(part, ()))
+            else:
+                break
+            for i in candidates:
+                if i not in found:
+                    found[i] = self._distance(query, query_int, i)
+            if done((radius + 1) * self.chunks - 1, found):
+                return found
+
+        for i in range(len(self.codes)):
+            if i not in found:
+                found[i] = self._distance(query, query_int, i)
+        return found
+
+    def within(self, query: Sequence[object], radius: int) -> list[tuple[int, int]]:
+        """Get `(index, distance)` of all codes within `radius` from `query`.
+
+        The result is sorted by distance.
+        """
+        found = self._search(query, lambda found_radius, _: found_radius >= radius)
+        result = [(i, dist) for i, dist in found.items() if dist <= radius]
+        result.sort(key=lambda item: (item[1], item[0]))
+        return result
+
+    def nearest(self, query: Sequence[object], k: int = 1) -> list[tuple[int, int]]:
+        """Get `(index, distance)` of `k` codes nearest to `query`.
+
+        The result is sorted by distance.
+        """
+        def done(found_radius: int, found: dict[int, int]) -> bool:
+            return sum(dist <= found_radius for dist in found.values()) >= k
+
+        found = self._search(query, done)
+        result = sorted(found.items(), key=lambda item: (item[1], item[0]))
+        return result[:k]
+
 
 class Levenshtein(_Base):
     """
@@ -73,6 +489,14 @@ class Levenshtein(_Base):
         * insertion:    ABC -> ABCD, EABC, AEBC..
         * substitution: ABC -> ABE, ADC, FBC..
 
+    If `max_distance` is passed and the distance is greater than it,
+    `max_distance + 1` is returned without calculating the exact distance.
+
+    `weights` are the costs of insertion, deletion, and substitution.
+    `costs` overrides them for specific elements: `(a, b)` is the cost
+    of substituting `a` by `b`, `(a, None)` is the cost of deleting `a`,
+    and `(None, b)` is the cost of inserting `b`. Costs can't be negative.
+
     https://en.wikipedia.org/wiki/Levenshtein_distance
     TODO: https://gist.github.com/kylebgorman/1081951/9b38b7743a3cb5167ab2c6608ac8eea7fc629dca
     """
@@ -82,12 +506,71 @@ class Levenshtein(_Base):
         qval: int = 1,
         test_func: TestFunc | None = None,
         external: bool = True,
+        weights: tuple[float, float, float] = (1, 1, 1),
+        costs: Mapping[tuple[Any, Any], float] | None = None,
     ) -> None:
         self.qval = qval
         self.test_func = test_func or self._ident
         self.external = external
+        self.weights = tuple(weights)
+        self.costs = costs
+        self._compile_costs()
+
+    def _compile_costs(self) -> None:
+        """Compile costs into lists indexed by element codes.
 
-    def _recursive(self, s1: Sequence[T], s2: Sequence[T]) -> int:
+        Elements mentioned in `costs` are encoded by their index in `_symbols`,
+        all other elements have code 0 and the default costs from `weights`.
+        """
+        costs = self.costs or {}
+        if min(self.weights) < 0 or any(cost < 0 for cost in costs.values()):
+            raise ValueError('costs can not be negative')
+        self._symbols: dict[Any, int] = {}
+        for pair in costs:
+            for element in pair:
+                if element is not None:
+                    self._symbols.setdefault(element, len(self._symbols) + 1)
+
+        size = len(self._symbols) + 1
+        insertion, deletion, substitution = self.weights
+        self._insert_costs = [insertion] * size
+        self._delete_costs = [deletion] * size
+        self._replace_costs = [[substitution] * size for _ in range(size)]
+        for (e1, e2), cost in costs.items():
+            if e1 is None:
+                self._insert_costs[self._symbols[e2]] = cost
+            elif e2 is None:
+                self._delete_costs[self._symbols[e1]] = cost
+            else:
+                self._replace_costs[self._symbols[e1]][self._symbols[e2]] = cost
+
+    @property
+    def _is_weighted(self) -> bool:
+        return bool(self.costs) or self.weights != (1, 1, 1)
+
+    def maximum(self, *sequences: Sequence[object]) -> float:
+        if not self._is_weighted:
+            return max(map(len, sequences))
+        return self._maximum(*self._get_sequences(*sequences))
+
+    def _maximum(self, s1: Sequence[T], s2: Sequence[T]) -> float:
+        if self.costs:
+            # delete everything and insert everything
+            codes1, codes2 = self._encode(s1), self._encode(s2)
+            deletions = sum(self._delete_costs[code] for code in codes1)
+            return deletions + sum(self._insert_costs[code] for code in codes2)
+        insertion, deletion, substitution = self.weights
+        result = min(len(s1), len(s2)) * min(substitution, insertion + deletion)
+        if len(s1) > len(s2):
+            return result + (len(s1) - len(s2)) * deletion
+        return result + (len(s2) - len(s1)) * insertion
+
+    def _encode(self, s: Sequence[T]) -> list[int]:
+        if not self._symbols:
+            return [0] * len(s)
+        return [self._symbols.get(c, 0) for c in s]
+
+    def _recursive(self, s1: Sequence[T], s2: Sequence[T]) -> float:
         # TODO: more than 2 sequences support
         if not s1 or not s2:
             return len(s1) + len(s2)
@@ -112,11 +595,7 @@ class Levenshtein(_Base):
         rows = len(s1) + 1
         cols = len(s2) + 1
         prev = None
-        cur: Any
-        if numpy:
-            cur = numpy.arange(cols)
-        else:
-            cur = range(cols)
+        cur = list(range(cols))
 
         for r in range(1, rows):
             prev, cur = cur, [r] + [0] * (cols - 1)
@@ -128,16 +607,370 @@ class Levenshtein(_Base):
                 cur[c] = min(edit, deletion, insertion)
         return int(cur[-1])
 
-    def __call__(self, s1: Sequence[T], s2: Sequence[T]) -> int:
-        s1, s2 = self._get_sequences(s1, s2)
+    def _banded(self, s1: Sequence[T], s2: Sequence[T], max_distance: int) -> int:
+        """
+        Ukkonen's cutoff: only the diagonal band of width `2 * max_distance + 1`
+        is filled, and the calculation stops as soon as the whole row
+        is over `max_distance`. Returns `max_distance + 1` in that case.
+        """
+        len1 = len(s1)
+        len2 = len(s2)
+        over = max_distance + 1
+        prev = [min(j, over) for j in range(len2 + 1)]
+        cur = [over] * (len2 + 1)
+        for r in range(1, len1 + 1):
+            low = max(1, r - max_distance)
+            high = min(len2, r + max_distance)
+            # the cell left to the band is either the first column or out of the band
+            cur[low - 1] = r if low == 1 else over
+            row_min = cur[low - 1]
+            for c in range(low, high + 1):
+                deletion = prev[c] + 1
+                insertion = cur[c - 1] + 1
+                dist = self.test_func(s1[r - 1], s2[c - 1])
+                edit = prev[c - 1] + (not dist)
+                cur[c] = min(edit, deletion, insertion, over)
+                if cur[c] < row_min:
+                    row_min = cur[c]
+            if row_min > max_distance:
+                return over
+            prev, cur = cur, prev
+        return prev[len2]
+
+    def _bit_parallel(
+        self,
+        s1: Sequence[T],
+        s2: Sequence[T],
+        max_distance: int | None = None,
+        masks: dict[T, int] | None = None,
+    ) -> int:
+        """
+        Myers/Hyyrö bit-parallel algorithm. Python ints are used as bit vectors
+        of arbitrary length, so every element of the shorter sequence costs
+        only a few big int operations instead of a full column of the matrix.
+        Supports only the default `test_func` and hashable elements.
+        `masks` are precomputed masks for `s1`.
+
+        https://www.win.tue.nl/~jfg/educ/bit.mat.pdf
+        https://www.researchgate.net/publication/2555924
+        """
+        if masks is None:
+            if len(s1) < len(s2):
+                s1, s2 = s2, s1
+            masks = self._get_masks(s1)
+
+        # every remaining element can decrease the distance at most by one
+        limit: float = float('inf')
+        if max_distance is not None:
+            limit = max_distance + len(s2)
+
+        dist = len(s1)
+        last = 1 << (dist - 1)
+        full = (1 << dist) - 1
+        vp = full   # vertical positive deltas
+        vn = 0      # vertical negative deltas
+        for i, c in enumerate(s2, start=1):
+            eq = masks.get(c, 0)
+            xv = eq | vn
+            xh = (((eq & vp) + vp) ^ vp) | eq
+            hp = vn | ~(xh | vp)
+            hn = vp & xh
+            if hp & last:
+                dist += 1
+            elif hn & last:
+                dist -= 1
+            hp = (hp << 1) | 1
+            hn <<= 1
+            vp = (hn | ~(xv | hp)) & full
+            vn = hp & xv
+            if dist + i > limit:
+                return max_distance + 1  # type: ignore[operator]
+        if max_distance is not None and dist > max_distance:
+            return max_distance + 1
+        return dist
+
+    def _rows(self, s1: Sequence[T], s2: Sequence[T]) -> Iterator[list[float]]:
+        """Rows of the matrix with costs from `weights` and `costs`.
+        """
+        codes1, codes2 = self._encode(s1), self._encode(s2)
+        insert_costs = self._insert_costs
+        delete_costs = self._delete_costs
+        custom = self.test_func is not self._ident
+
+        cur: list[float] = [0]
+        for code2 in codes2:
+            cur.append(cur[-1] + insert_costs[code2])
+        yield cur
+        for c1, code1 in zip(s1, codes1):
+            deletion = delete_costs[code1]
+            replace_costs = self._replace_costs[code1]
+            prev, cur = cur, [cur[0] + deletion]
+            left = cur[0]
+            for c2, code2, diagonal, up in zip(s2, codes2, prev, prev[1:]):
+                if self.test_func(c1, c2) if custom else c1 == c2:
+                    dist = diagonal
+                else:
+                    dist = diagonal + replace_costs[code2]
+                # deletion
+                if up + deletion < dist:
+                    dist = up + deletion
+                # insertion
+                if left + insert_costs[code2] < dist:
+                    dist = left + insert_costs[code2]
+                cur.append(dist)
+                left = dist
+            yield cur
+
+    def _numpy(self, s1: Sequence[T], s2: Sequence[T]) -> float:
+        """
+        Wavefront algorithm: every anti-diagonal of the matrix depends only
+        on the two previous ones, so it is calculated by a few vector operations
+        over integer-encoded sequences. Only three diagonals are stored.
+        Supports `weights` and `costs` but not a custom `test_func`.
+        Elements must be hashable.
+        """
+        len1 = len(s1)
+        len2 = len(s2)
+        ids: dict[T, int] = {}
+        ids1 = numpy.array([ids.setdefault(c, len(ids)) for c in s1], dtype=numpy.intp)
+        # the second sequence is reversed to make its part of every diagonal a slice
+        ids2 = numpy.array([ids.setdefault(c, len(ids)) for c in reversed(s2)], dtype=numpy.intp)
+        codes1 = numpy.array(self._encode(s1), dtype=numpy.intp)
+        codes2 = numpy.array(self._encode(s2)[::-1], dtype=numpy.intp)
+        delete_costs = numpy.array(self._delete_costs)[codes1]
+        insert_costs = numpy.array(self._insert_costs)[codes2]
+        replace_costs = numpy.array(self._replace_costs)
+        dtype = replace_costs.dtype
+
+        # the first column and the first row of the matrix
+        first_col = numpy.concatenate(([0], numpy.cumsum(delete_costs)))
+        first_row = numpy.concatenate(([0], numpy.cumsum(insert_costs[::-1])))
+
+        # diagonals are indexed by the row number
+        prev2 = numpy.zeros(len1 + 1, dtype=dtype)
+        prev = numpy.zeros(len1 + 1, dtype=dtype)
+        cur = numpy.zeros(len1 + 1, dtype=dtype)
+        for d in range(1, len1 + len2 + 1):
+            if d <= len2:
+                cur[0] = first_row[d]
+            if d <= len1:
+                cur[d] = first_col[d]
+            low = max(1, d - len2)
+            high = min(len1, d - 1)
+            if low <= high:
+                # rows are `low..high`, columns are `d - low..d - high`
+                rows = slice(low - 1, high)
+                cols = slice(len2 - d + low, len2 - d + high + 1)
+                edit = numpy.where(
+                    ids1[rows] == ids2[cols],
+                    0,
+                    replace_costs[codes1[rows], codes2[cols]],
+                )
+                edit += prev2[rows]
+                numpy.minimum(edit, prev[rows] + delete_costs[rows], out=edit)
+                numpy.minimum(edit, prev[low:high + 1] + insert_costs[cols], out=edit)
+                cur[low:high + 1] = edit
+            prev2, prev, cur = prev, cur, prev2
+        return prev[len1].item()
+
+    def _weighted(self, s1: Sequence[T], s2: Sequence[T], max_distance: float | None = None) -> float:
+        """
+        Wagner-Fischer algorithm with the costs precompiled into lists,
+        so there are no function calls in the inner loop.
+        Long sequences are passed into the numpy wavefront if possible.
+        """
+        distance = None
+        wavefront = _use_wavefront(len(s1), len(s2), min_diagonal=_WEIGHTED_WAVEFRONT_MIN_DIAGONAL)
+        if wavefront and self.test_func is self._ident:
+            with suppress(TypeError):  # unhashable elements
+                distance = self._numpy(s1, s2)
+        if distance is None:
+            cur: list[float] = []
+            for cur in self._rows(s1, s2):
+                # costs aren't negative, so the distance can only grow
+                if max_distance is not None and min(cur) > max_distance:
+                    return max_distance + 1
+            distance = cur[-1]
+        # float costs can add up to more than the maximum because of rounding
+        distance = min(distance, self._maximum(s1, s2))
+        if max_distance is not None and distance > max_distance:
+            return max_distance + 1
+        return distance
+
+    def _compare(
+        self,
+        s1: Sequence[T],
+        s2: Sequence[T],
+        max_distance: int | None = None,
+        masks: dict[T, int] | None = None,
+    ) -> float:
+        if self._is_weighted:
+            if self._ident(s1, s2):
+                return 0
+            return self._weighted(s1, s2, max_distance)
+
+        # the length difference alone is over the cutoff
+        if max_distance is not None and abs(len(s1) - len(s2)) > max_distance:
+            return max_distance + 1
 
         result = self.quick_answer(s1, s2)
         if result is not None:
             assert isinstance(result, int)
+            if max_distance is not None and result > max_distance:
+                return max_distance + 1
             return result
 
+        # skip the common prefix and suffix, some optimal alignment always matches them.
+        # Masks from `compile` are built for the whole s1, so don't trim then.
+        if masks is None:
+            prefix, suffix = self._common_affix(s1, s2, self.test_func)
+            if prefix or suffix:
+                s1 = s1[prefix:len(s1) - suffix]
+                s2 = s2[prefix:len(s2) - suffix]
+                # the length difference, it is already checked against the cutoff
+                if not s1 or not s2:
+                    return len(s1) + len(s2)
+
+        if self.test_func is self._ident:
+            try:
+                return self._bit_parallel(s1, s2, max_distance, masks)
+            except TypeError:  # unhashable elements
+                pass
+        if max_distance is not None:
+            return self._banded(s1, s2, max_distance)
         return self._cycled(s1, s2)
 
+    def __call__(self, s1: Sequence[T], s2: Sequence[T], max_distance: int | None = None) -> float:
+        s1, s2 = self._get_sequences(s1, s2)
+        return self._compare(s1, s2, max_distance)
+
+    def distance(self, s1: Sequence[T], s2: Sequence[T], max_distance: int | None = None) -> float:
+        return self(s1, s2, max_distance=max_distance)
+
+    def compile(self, query: Sequence[T]) -> Callable[..., float]:
+        s1 = self._get_sequences(query)[0]
+        masks = None
+        if self.test_func is self._ident and not self._is_weighted:
+            with suppress(TypeError):  # unhashable elements
+                masks = self._get_masks(s1)
+
+        def compiled(s2: Sequence[T], max_distance: int | None = None) -> float:
+            s2 = self._get_sequences(s2)[0]
+            return self._compare(s1, s2, max_distance, masks)
+        return compiled
+
+    def _last_row(self, s1: Sequence[T], s2: Sequence[T]) -> list[float]:
+        """Distances between `s1` and every prefix of `s2`.
+        """
+        if s1 and self.test_func is self._ident and not self._is_weighted:
+            with suppress(TypeError):  # unhashable elements
+                return self._bit_parallel_row(s1, s2)
+        # keep only the last row in memory
+        row, = deque(self._rows(s1, s2), maxlen=1)
+        return row
+
+    def _bit_parallel_row(self, s1: Sequence[T], s2: Sequence[T]) -> list[float]:
+        """The same as `_bit_parallel` but returns the whole last row of the matrix.
+        """
+        masks = self._get_masks(s1)
+        dist = len(s1)
+        last = 1 << (dist - 1)
+        full = (1 << dist) - 1
+        vp = full
+        vn = 0
+        row: list[float] = [dist]
+        for c in s2:
+            eq = masks.get(c, 0)
+            xv = eq | vn
+            xh = (((eq & vp) + vp) ^ vp) | eq
+            hp = vn | ~(xh | vp)
+            hn = vp & xh
+            if hp & last:
+                dist += 1
+            elif hn & last:
+                dist -= 1
+            hp = (hp << 1) | 1
+            hn <<= 1
+            vp = (hn | ~(xv | hp)) & full
+            vn = hp & xv
+            row.append(dist)
+        return row
+
+    def _traceback(self, s1: Sequence[T], s2: Sequence[T], i0: int, j0: int) -> list[tuple[str, int, int]]:
+        """Edit operations from the full matrix. Used only for short sequences.
+        """
+        d = list(self._rows(s1, s2))
+        codes1, codes2 = self._encode(s1), self._encode(s2)
+
+        ops = []
+        i, j = len(s1), len(s2)
+        while i or j:
+            if i and j:
+                equal = self.test_func(s1[i - 1], s2[j - 1])
+                cost = 0 if equal else self._replace_costs[codes1[i - 1]][codes2[j - 1]]
+                if d[i][j] == d[i - 1][j - 1] + cost:
+                    i -= 1
+                    j -= 1
+                    ops.append(('equal' if equal else 'replace', i0 + i, j0 + j))
+                    continue
+            if i and d[i][j] == d[i - 1][j] + self._delete_costs[codes1[i - 1]]:
+                i -= 1
+                ops.append(('delete', i0 + i, j0 + j))
+            else:
+                j -= 1
+                ops.append(('insert', i0 + i, j0 + j))
+        ops.reverse()
+        return ops
+
+    def _hirschberg(
+        self,
+        s1: Sequence[T],
+        s2: Sequence[T],
+        i0: int,
+        j0: int,
+        ops: list[tuple[str, int, int]],
+    ) -> None:
+        """
+        Hirschberg's divide and conquer: find where the optimal path crosses
+        the middle row of the matrix using only the last rows of the forward
+        and the backward matrices, and recurse into the two halves.
+
+        https://en.wikipedia.org/wiki/Hirschberg%27s_algorithm
+        """
+        if len(s1) <= 1 or len(s2) <= 1:
+            ops.extend(self._traceback(s1, s2, i0, j0))
+            return
+        mid = len(s1) // 2
+        left = self._last_row(s1[:mid], s2)
+        right = self._last_row(s1[mid:][::-1], s2[::-1])
+        size = len(s2)
+        split = min(range(size + 1), key=lambda j: left[j] + right[size - j])
+        self._hirschberg(s1[:mid], s2[:split], i0, j0, ops)
+        self._hirschberg(s1[mid:], s2[split:], i0 + mid, j0 + split, ops)
+
+    def _steps(self, s1: Sequence[T], s2: Sequence[T]) -> list[tuple[str, int, int]]:
+        s1, s2 = self._get_sequences(s1, s2)
+        ops: list[tuple[str, int, int]] = []
+        self._hirschberg(s1, s2, 0, 0, ops)
+        return ops
+
+    def editops(self, s1: Sequence[T], s2: Sequence[T]) -> list[tuple[str, int, int]]:
+        """Get the edit operations transforming `s1` into `s2`.
+
+        Every operation is a tuple of the operation name ("replace", "delete",
+        or "insert"), position in `s1`, and position in `s2`.
+        Hirschberg's algorithm is used, so memory usage is linear.
+        """
+        return [op for op in self._steps(s1, s2) if op[0] != 'equal']
+
+    def opcodes(self, s1: Sequence[T], s2: Sequence[T]) -> list[tuple[str, int, int, int, int]]:
+        """Get the edit operations as `difflib.SequenceMatcher.get_opcodes` does.
+
+        Every opcode is a tuple `(tag, i1, i2, j1, j2)` describing that
+        `s1[i1:i2]` should be replaced, deleted, inserted, or is equal to `s2[j1:j2]`.
+        """
+        return _opcodes(self._steps(s1, s2))
+
 
 class DamerauLevenshtein(_Base):
     """
@@ -169,116 +1002,137 @@ class DamerauLevenshtein(_Base):
         self.external = external
         self.restricted = restricted
 
-    def _numpy(self, s1: Sequence[T], s2: Sequence[T]) -> int:
-        # TODO: doesn't pass tests, need improve
-        d = numpy.zeros([len(s1) + 1, len(s2) + 1], dtype=int)
-
-        # matrix
-        for i in range(-1, len(s1) + 1):
-            d[i][-1] = i + 1
-        for j in range(-1, len(s2) + 1):
-            d[-1][j] = j + 1
-
-        for i, cs1 in enumerate(s1):
-            for j, cs2 in enumerate(s2):
-                cost = int(not self.test_func(cs1, cs2))
-                # ^ 0 if equal, 1 otherwise
-
-                d[i][j] = min(
-                    d[i - 1][j] + 1,            # deletion
-                    d[i][j - 1] + 1,            # insertion
-                    d[i - 1][j - 1] + cost,     # substitution
-                )
-
-                # transposition
-                if not i or not j:
-                    continue
-                if not self.test_func(cs1, s2[j - 1]):
-                    continue
-                d[i][j] = min(
-                    d[i][j],
-                    d[i - 2][j - 2] + cost,
-                )
+    def _bit_parallel(self, s1: Sequence[T], s2: Sequence[T]) -> int:
+        """
+        Hyyrö's bit-parallel optimal string alignment (restricted) distance.
+        It is Myers' algorithm for Levenshtein with one more bit vector
+        for the cells where a transposition is possible.
+        Supports only the default `test_func` and hashable elements.
 
-        return d[len(s1) - 1][len(s2) - 1]
+        https://www.researchgate.net/publication/2555924
+        """
+        if len(s1) < len(s2):
+            s1, s2 = s2, s1
+        masks = self._get_masks(s1)
+
+        dist = len(s1)
+        last = 1 << (dist - 1)
+        full = (1 << dist) - 1
+        vp = full   # vertical positive deltas
+        vn = 0      # vertical negative deltas
+        d0 = 0      # diagonal zero deltas
+        prev_eq = 0
+        for c in s2:
+            eq = masks.get(c, 0)
+            transpositions = ((~d0 & eq) << 1) & prev_eq
+            d0 = (((eq & vp) + vp) ^ vp) | eq | vn | transpositions
+            hp = vn | ~(d0 | vp)
+            hn = vp & d0
+            if hp & last:
+                dist += 1
+            elif hn & last:
+                dist -= 1
+            hp = (hp << 1) | 1
+            hn <<= 1
+            vp = (hn | ~(d0 | hp)) & full
+            vn = hp & d0
+            prev_eq = eq
+        return dist
 
     def _pure_python_unrestricted(self, s1: Sequence[T], s2: Sequence[T]) -> int:
-        """https://en.wikipedia.org/wiki/Damerau%E2%80%93Levenshtein_distance
         """
-        d: dict[tuple[int, int], int] = {}
-        da: dict[T, int] = {}
+        Zhao and Sahni's linear-memory algorithm. Besides two rows of the matrix,
+        it keeps only the values needed for transpositions: one row of them
+        and the last row where every element of `s1` occurs.
 
-        len1 = len(s1)
-        len2 = len(s2)
+        https://bmcbioinformatics.biomedcentral.com/articles/10.1186/s12859-019-2819-0
+        """
+        custom = self.test_func is not self._ident
+        ids: dict[T, int] = {}
+        codes1 = [ids.setdefault(c, len(ids)) for c in s1]
+        codes2 = [ids.setdefault(c, len(ids)) for c in s2]
+        last_rows = [-1] * len(ids)
 
-        maxdist = len1 + len2
-        d[-1, -1] = maxdist
-
-        # matrix
-        for i in range(len(s1) + 1):
-            d[i, -1] = maxdist
-            d[i, 0] = i
-        for j in range(len(s2) + 1):
-            d[-1, j] = maxdist
-            d[0, j] = j
-
-        for i, cs1 in enumerate(s1, start=1):
-            db = 0
-            for j, cs2 in enumerate(s2, start=1):
-                i1 = da.get(cs2, 0)
-                j1 = db
-                if self.test_func(cs1, cs2):
-                    cost = 0
-                    db = j
+        len2 = len(s2)
+        over = max(len(s1), len2) + 1
+        # the last item is a sentinel for the column before the first one
+        prev = [over] * (len2 + 2)
+        cur = list(range(len2 + 1)) + [over]
+        # the cell one row up and two columns to the left of the last match in the column
+        transposed = [over] * (len2 + 2)
+        for i, (c1, code1) in enumerate(zip(s1, codes1), start=1):
+            prev, cur = cur, prev
+            last_col = -1
+            # the cell two rows up and to the left of the last match in the row
+            last_match = over
+            # `cur` holds the row `i - 2` until it is overwritten
+            up2_left = cur[0]
+            cur[0] = i
+            for j, (c2, code2) in enumerate(zip(s2, codes2), start=1):
+                equal = self.test_func(c1, c2) if custom else code1 == code2
+                dist = prev[j - 1] + (not equal)
+                # deletion
+                if prev[j] + 1 < dist:
+                    dist = prev[j] + 1
+                # insertion
+                if cur[j - 1] + 1 < dist:
+                    dist = cur[j - 1] + 1
+
+                if equal:
+                    last_col = j
+                    transposed[j] = prev[j - 2]
+                    last_match = up2_left
                 else:
-                    cost = 1
-
-                d[i, j] = min(
-                    d[i - 1, j - 1] + cost,     # substitution
-                    d[i, j - 1] + 1,            # insertion
-                    d[i - 1, j] + 1,            # deletion
-                    d[i1 - 1, j1 - 1] + (i - i1) - 1 + (j - j1),  # transposition
-                )
-            da[cs1] = i
-
-        return d[len1, len2]
+                    # transposition with the last c2 in s1 or the last c1 in s2
+                    last_row = last_rows[code2]
+                    if j - last_col == 1:
+                        dist = min(dist, transposed[j] + i - last_row)
+                    elif i - last_row == 1:
+                        dist = min(dist, last_match + j - last_col)
+                up2_left = cur[j]
+                cur[j] = dist
+            last_rows[code1] = i
+        return cur[len2]
 
     def _pure_python_restricted(self, s1: Sequence[T], s2: Sequence[T]) -> int:
         """
-        https://www.guyrutenberg.com/2008/12/15/damerau-levenshtein-distance-in-python/
+        Optimal string alignment distance.
+        Only three rows of the matrix are kept: a transposition
+        looks two rows back.
         """
-        d: dict[tuple[int, int], int] = {}
-
-        # matrix
-        for i in range(-1, len(s1) + 1):
-            d[i, -1] = i + 1
-        for j in range(-1, len(s2) + 1):
-            d[-1, j] = j + 1
-
-        for i, cs1 in enumerate(s1):
-            for j, cs2 in enumerate(s2):
-                cost = int(not self.test_func(cs1, cs2))
-                # ^ 0 if equal, 1 otherwise
-
-                d[i, j] = min(
-                    d[i - 1, j] + 1,            # deletion
-                    d[i, j - 1] + 1,            # insertion
-                    d[i - 1, j - 1] + cost,     # substitution
-                )
-
+        custom = self.test_func is not self._ident
+        len2 = len(s2)
+        prev2 = [0] * (len2 + 1)
+        prev = list(range(len2 + 1))
+        cur = [0] * (len2 + 1)
+        prev_c1: T | None = None
+        for i, c1 in enumerate(s1, start=1):
+            cur[0] = i
+            left = i
+            prev_c2: T | None = None
+            for j, c2 in enumerate(s2, start=1):
+                cost = not (self.test_func(c1, c2) if custom else c1 == c2)
+                dist = prev[j - 1] + cost
+                # deletion
+                if prev[j] + 1 < dist:
+                    dist = prev[j] + 1
+                # insertion
+                if left + 1 < dist:
+                    dist = left + 1
                 # transposition
-                if not i or not j:
-                    continue
-                if not self.test_func(cs1, s2[j - 1]):
-                    continue
-                if not self.test_func(s1[i - 1], cs2):
-                    continue
-                d[i, j] = min(
-                    d[i, j],
-                    d[i - 2, j - 2] + cost,
-                )
-
-        return d[len(s1) - 1, len(s2) - 1]
+                if i > 1 and j > 1 and prev2[j - 2] + cost < dist:
+                    if custom:
+                        transposed = self.test_func(c1, prev_c2) and self.test_func(prev_c1, c2)
+                    else:
+                        transposed = c1 == prev_c2 and prev_c1 == c2
+                    if transposed:
+                        dist = prev2[j - 2] + cost
+                cur[j] = dist
+                left = dist
+                prev_c2 = c2
+            prev2, prev, cur = prev, cur, prev2
+            prev_c1 = c1
+        return prev[len2]
 
     def __call__(self, s1: Sequence[T], s2: Sequence[T]) -> int:
         s1, s2 = self._get_sequences(s1, s2)
@@ -287,10 +1141,18 @@ class DamerauLevenshtein(_Base):
         if result is not None:
             return result  # type: ignore[return-value]
 
-        # if numpy:
-        #     return self._numpy(s1, s2)
-        # else:
+        # transpositions don't break it for real equality, but do for custom test_func
+        if self.test_func is self._ident:
+            prefix, suffix = self._common_affix(s1, s2)
+            s1 = s1[prefix:len(s1) - suffix]
+            s2 = s2[prefix:len(s2) - suffix]
+            if not s1 or not s2:
+                return len(s1) + len(s2)
+
         if self.restricted:
+            if self.test_func is self._ident:
+                with suppress(TypeError):  # unhashable elements
+                    return self._bit_parallel(s1, s2)
             return self._pure_python_restricted(s1, s2)
         return self._pure_python_unrestricted(s1, s2)
 
@@ -302,6 +1164,9 @@ class JaroWinkler(_BaseSimilarity):
     have a low Jaro score, but share a prefix.
     and thus are likely to match.
 
+    If `score_cutoff` is passed and the score is less than it, 0 is returned.
+    Pairs that can't reach it by `upper_bound` are rejected without matching.
+
     https://en.wikipedia.org/wiki/Jaro%E2%80%93Winkler_distance
     https://github.com/Yomguithereal/talisman/blob/master/src/metrics/jaro.js
     https://github.com/Yomguithereal/talisman/blob/master/src/metrics/jaro-winkler.js
@@ -322,20 +1187,11 @@ class JaroWinkler(_BaseSimilarity):
     def maximum(self, *sequences: Sequence[object]) -> int:
         return 1
 
-    def __call__(self, s1: Sequence[T], s2: Sequence[T], prefix_weight: float = 0.1) -> float:
-        s1, s2 = self._get_sequences(s1, s2)
-
-        result = self.quick_answer(s1, s2)
-        if result is not None:
-            return result
-
+    def _matches(self, s1: Sequence[T], s2: Sequence[T]) -> tuple[int, int]:
+        """Get the number of matching characters and transpositions.
+        """
         s1_len = len(s1)
         s2_len = len(s2)
-
-        if not s1_len or not s2_len:
-            return 0.0
-
-        min_len = min(s1_len, s2_len)
         search_range = max(s1_len, s2_len)
         search_range = (search_range // 2) - 1
         if search_range < 0:
@@ -357,7 +1213,7 @@ class JaroWinkler(_BaseSimilarity):
 
         # short circuit if no characters match
         if not common_chars:
-            return 0.0
+            return 0, 0
 
         # count transpositions
         k = trans_count = 0
@@ -369,7 +1225,58 @@ class JaroWinkler(_BaseSimilarity):
                         break
                 if s1[i] != s2[j]:
                     trans_count += 1
-        trans_count //= 2
+        return common_chars, trans_count // 2
+
+    def _bit_parallel(self, s1: Sequence[T], s2: Sequence[T], masks: dict[T, int] | None = None) -> tuple[int, int]:
+        """
+        The same as `_matches`, but positions of characters in `s2` are bits of ints.
+        The first not yet matched position in the search window
+        is the lowest bit of `mask & window & ~matched`.
+        `masks` are precomputed masks for `s2`.
+        """
+        if masks is None:
+            masks = self._get_masks(s2)
+        search_range = max(len(s1), len(s2))
+        search_range = max(search_range // 2 - 1, 0)
+
+        # positions from `i - search_range` to `i + search_range`
+        window = (1 << (search_range + 1)) - 1
+        s2_matched = 0
+        s1_matched = []
+        for i, s1_ch in enumerate(s1):
+            candidates = masks.get(s1_ch, 0) & window & ~s2_matched
+            if candidates:
+                s2_matched |= candidates & -candidates
+                s1_matched.append(s1_ch)
+            window <<= 1
+            # the window grows until it stops touching the beginning
+            if i < search_range:
+                window |= 1
+
+        # matched characters of s1 and s2 in order
+        trans_count = 0
+        for s1_ch in s1_matched:
+            lowest = s2_matched & -s2_matched
+            if not masks[s1_ch] & lowest:
+                trans_count += 1
+            s2_matched ^= lowest
+        return len(s1_matched), trans_count // 2
+
+    def _weight(
+        self,
+        s1: Sequence[T],
+        s2: Sequence[T],
+        common_chars: int,
+        trans_count: int,
+        prefix_weight: float,
+    ) -> float:
+        """Get the score for the given numbers of matches and transpositions.
+
+        The score only grows with `common_chars`.
+        """
+        s1_len = len(s1)
+        s2_len = len(s2)
+        min_len = min(s1_len, s2_len)
 
         # adjust for similarities in nonmatched characters
         weight = common_chars / s1_len + common_chars / s2_len
@@ -402,6 +1309,81 @@ class JaroWinkler(_BaseSimilarity):
         weight += (1.0 - weight) * tmp
         return weight
 
+    def _upper_bound(self, s1: Sequence[T], s2: Sequence[T], prefix_weight: float, counts: bool = True) -> float:
+        if self._ident(s1, s2):
+            return 1
+        if not s1 or not s2:
+            return 0.0
+        # no transpositions and all characters are matched
+        common_chars = min(len(s1), len(s2))
+        if counts:
+            with suppress(TypeError):  # unhashable elements
+                common_chars = sum((Counter(s1) & Counter(s2)).values())
+        if not common_chars:
+            return 0.0
+        return self._weight(s1, s2, common_chars, 0, prefix_weight)
+
+    def upper_bound(self, s1: Sequence[T], s2: Sequence[T], prefix_weight: float = 0.1) -> float:
+        """Get a score that the sequences can't exceed.
+
+        It is calculated in linear time from the lengths of the sequences
+        and the numbers of every character in them.
+        """
+        s1, s2 = self._get_sequences(s1, s2)
+        return self._upper_bound(s1, s2, prefix_weight)
+
+    def _compare(
+        self,
+        s1: Sequence[T],
+        s2: Sequence[T],
+        prefix_weight: float,
+        masks: dict[T, int] | None = None,
+        score_cutoff: float | None = None,
+    ) -> float:
+        if score_cutoff is not None:
+            # the bound from lengths is O(1), the bound from counts is O(n)
+            if self._upper_bound(s1, s2, prefix_weight, counts=False) < score_cutoff:
+                return 0.0
+            if self._upper_bound(s1, s2, prefix_weight) < score_cutoff:
+                return 0.0
+
+        weight = self.quick_answer(s1, s2)
+        if weight is None:
+            try:
+                common_chars, trans_count = self._bit_parallel(s1, s2, masks)
+            except TypeError:  # unhashable elements
+                common_chars, trans_count = self._matches(s1, s2)
+            # short circuit if no characters match
+            if not common_chars:
+                return 0.0
+            weight = self._weight(s1, s2, common_chars, trans_count, prefix_weight)
+
+        if score_cutoff is not None and weight < score_cutoff:
+            return 0.0
+        return weight
+
+    def __call__(
+        self,
+        s1: Sequence[T],
+        s2: Sequence[T],
+        prefix_weight: float = 0.1,
+        score_cutoff: float | None = None,
+    ) -> float:
+        s1, s2 = self._get_sequences(s1, s2)
+        return self._compare(s1, s2, prefix_weight, score_cutoff=score_cutoff)
+
+    def compile(self, query: Sequence[T]) -> Callable[..., float]:
+        s1 = self._get_sequences(query)[0]
+        masks = None
+        with suppress(TypeError):  # unhashable elements
+            masks = self._get_masks(s1)
+
+        def compiled(s2: Sequence[T], prefix_weight: float = 0.1, score_cutoff: float | None = None) -> float:
+            s2 = self._get_sequences(s2)[0]
+            # the matching is symmetric, so the query can be the masked side
+            return self._compare(s2, s1, prefix_weight, masks, score_cutoff)
+        return compiled
+
 
 class Jaro(JaroWinkler):
     def __init__(
@@ -418,6 +1400,236 @@ class Jaro(JaroWinkler):
         )
 
 
+class _Aligner:
+    """Linear memory global alignment with linear gaps.
+
+    Hirschberg's divide and conquer finds the cell in which the optimal path
+    crosses the middle row of the matrix from the middle rows of the forward
+    and the backward matrices, and aligns both halves recursively.
+    Rows are tuples of rows of all states of the cells,
+    here it is only one state, the best score.
+
+    https://en.wikipedia.org/wiki/Hirschberg%27s_algorithm
+    """
+
+    def __init__(self, sim_func: Callable[[Any, Any], float], gap_cost: float) -> None:
+        self.sim_func = sim_func
+        self.gap_cost = gap_cost
+
+    def _rows(self, s1: Sequence[T], s2: Sequence[T], start: int) -> Iterator[tuple[list[float], ...]]:
+        """Rows of the matrix for the path starting in the `start` state.
+        """
+        sim_func = self.sim_func
+        gap = self.gap_cost
+        row = [-float(j * gap) for j in range(len(s2) + 1)]
+        yield (row,)
+        for i, c1 in enumerate(s1, 1):
+            left = -float(i * gap)
+            cur = [left]
+            for c2, diagonal, up in zip(s2, row, row[1:]):
+                left = max(diagonal + sim_func(c1, c2), up - gap, left - gap)
+                cur.append(left)
+            row = cur
+            yield (row,)
+
+    def _backward_row(self, s1: Sequence[T], s2: Sequence[T], end: int | None) -> tuple[list[float], ...]:
+        """The best scores from every cell of the first row to the end
+        by the state of this cell.
+
+        If `end` is passed, the path must come to the end in this state.
+        """
+        sim_func = self.sim_func
+        gap = self.gap_cost
+        size = len(s2)
+        row = [-float((size - j) * gap) for j in range(size + 1)]
+        for i, c1 in enumerate(reversed(s1), 1):
+            right = -float(i * gap)
+            cur = [right]
+            for c2, diagonal, down in zip(reversed(s2), row[::-1], row[-2::-1]):
+                right = max(diagonal + sim_func(c1, c2), down - gap, right - gap)
+                cur.append(right)
+            cur.reverse()
+            row = cur
+        return (row,)
+
+    def _traceback(
+        self,
+        s1: Sequence[T],
+        s2: Sequence[T],
+        start: int,
+        end: int | None,
+        i0: int,
+        j0: int,
+    ) -> list[tuple[str, int, int]]:
+        """Alignment steps from the full matrix. Used only if one sequence is short.
+        """
+        matrix = [rows[0] for rows in self._rows(s1, s2, start)]
+        gap = self.gap_cost
+        i, j = len(s1), len(s2)
+        steps = []
+        while i or j:
+            value = matrix[i][j]
+            if i and j and matrix[i - 1][j - 1] + self.sim_func(s1[i - 1], s2[j - 1]) == value:
+                i -= 1
+                j -= 1
+                steps.append(('equal' if s1[i] == s2[j] else 'replace', i0 + i, j0 + j))
+            elif i and matrix[i - 1][j] - gap == value:
+                i -= 1
+                steps.append(('delete', i0 + i, j0 + j))
+            else:
+                j -= 1
+                steps.append(('insert', i0 + i, j0 + j))
+        steps.reverse()
+        return steps
+
+    def _hirschberg(
+        self,
+        s1: Sequence[T],
+        s2: Sequence[T],
+        start: int,
+        end: int | None,
+        i0: int,
+        j0: int,
+        steps: list[tuple[str, int, int]],
+    ) -> None:
+        if len(s1) <= 1 or len(s2) <= 1:
+            steps.extend(self._traceback(s1, s2, start, end, i0, j0))
+            return
+        mid = len(s1) // 2
+        # keep only the last row in memory
+        forward, = deque(self._rows(s1[:mid], s2, start), maxlen=1)
+        backward = self._backward_row(s1[mid:], s2, end)
+        split, state = max(
+            ((j, state) for state in range(len(forward)) for j in range(len(s2) + 1)),
+            key=lambda cell: forward[cell[1]][cell[0]] + backward[cell[1]][cell[0]],
+        )
+        self._hirschberg(s1[:mid], s2[:split], start, state, i0, j0, steps)
+        self._hirschberg(s1[mid:], s2[split:], state, end, i0 + mid, j0 + split, steps)
+
+    def steps(self, s1: Sequence[T], s2: Sequence[T], i0: int = 0, j0: int = 0) -> list[tuple[str, int, int]]:
+        """Get steps of the optimal alignment.
+
+        Every step is a tuple of the operation name ("equal", "replace",
+        "delete", or "insert"), position in `s1` plus `i0`, and position in `s2` plus `j0`.
+        """
+        steps: list[tuple[str, int, int]] = []
+        self._hirschberg(s1, s2, 0, None, i0, j0, steps)
+        return steps
+
+
+class _AffineAligner(_Aligner):
+    """Linear memory global alignment with affine gaps, as in `Gotoh`.
+
+    A gap of `k` elements costs `gap_open + (k - 1) * gap_ext`.
+    Every cell has three states, by the last step to it: a match (D),
+    a deletion (P), or an insertion (Q). A deletion can't directly follow
+    an insertion and vice versa. Both halves of the matrix share the state
+    of the cell where the path crosses the middle row, so a gap crossing
+    the middle row is opened only once, as in the Myers-Miller algorithm.
+    """
+
+    def __init__(self, sim_func: Callable[[Any, Any], float], gap_open: float, gap_ext: float) -> None:
+        self.sim_func = sim_func
+        self.gap_open = gap_open
+        self.gap_ext = gap_ext
+
+    def _rows(self, s1: Sequence[T], s2: Sequence[T], start: int) -> Iterator[tuple[list[float], ...]]:
+        sim_func = self.sim_func
+        gap_open = self.gap_open
+        gap_ext = self.gap_ext
+        inf = float('-inf')
+        d_row = [inf] * (len(s2) + 1)
+        p_row = [inf] * (len(s2) + 1)
+        q_row = [inf] * (len(s2) + 1)
+        (d_row, p_row, q_row)[start][0] = 0.0
+        for j in range(1, len(s2) + 1):
+            q_row[j] = max(d_row[j - 1] - gap_open, q_row[j - 1] - gap_ext)
+        yield d_row, p_row, q_row
+
+        for c1 in s1:
+            d = q = inf
+            p = max(d_row[0] - gap_open, p_row[0] - gap_ext)
+            d_cur = [d]
+            p_cur = [p]
+            q_cur = [q]
+            for j, c2 in enumerate(s2, 1):
+                q = max(d - gap_open, q - gap_ext)
+                d = max(d_row[j - 1], p_row[j - 1], q_row[j - 1]) + sim_func(c1, c2)
+                p = max(d_row[j] - gap_open, p_row[j] - gap_ext)
+                d_cur.append(d)
+                p_cur.append(p)
+                q_cur.append(q)
+            d_row, p_row, q_row = d_cur, p_cur, q_cur
+            yield d_row, p_row, q_row
+
+    def _backward_row(self, s1: Sequence[T], s2: Sequence[T], end: int | None) -> tuple[list[float], ...]:
+        sim_func = self.sim_func
+        gap_open = self.gap_open
+        gap_ext = self.gap_ext
+        inf = float('-inf')
+        size = len(s2)
+        d_row = [inf] * (size + 1)
+        p_row = [inf] * (size + 1)
+        q_row = [inf] * (size + 1)
+        for state, row in enumerate((d_row, p_row, q_row)):
+            if end is None or end == state:
+                row[size] = 0.0
+        # only insertions are left in the last row
+        for j in range(size - 1, -1, -1):
+            d_row[j] = q_row[j + 1] - gap_open
+            q_row[j] = max(q_row[j], q_row[j + 1] - gap_ext)
+
+        for c1 in reversed(s1):
+            d_cur = [inf] * (size + 1)
+            p_cur = [inf] * (size + 1)
+            q_cur = [inf] * (size + 1)
+            d_cur[size] = p_row[size] - gap_open
+            p_cur[size] = p_row[size] - gap_ext
+            for j in range(size - 1, -1, -1):
+                match = d_row[j + 1] + sim_func(c1, s2[j])
+                delete = p_row[j]
+                insert = q_cur[j + 1]
+                d_cur[j] = max(match, delete - gap_open, insert - gap_open)
+                p_cur[j] = max(match, delete - gap_ext)
+                q_cur[j] = max(match, insert - gap_ext)
+            d_row, p_row, q_row = d_cur, p_cur, q_cur
+        return d_row, p_row, q_row
+
+    def _traceback(
+        self,
+        s1: Sequence[T],
+        s2: Sequence[T],
+        start: int,
+        end: int | None,
+        i0: int,
+        j0: int,
+    ) -> list[tuple[str, int, int]]:
+        matrix = list(self._rows(s1, s2, start))
+        i, j = len(s1), len(s2)
+        state = end
+        if state is None:
+            state = max(range(3), key=lambda s: matrix[i][s][j])
+
+        steps = []
+        while i or j:
+            value = matrix[i][state][j]
+            if state == 0:
+                i -= 1
+                j -= 1
+                state = max(range(3), key=lambda s: matrix[i][s][j])
+                steps.append(('equal' if s1[i] == s2[j] else 'replace', i0 + i, j0 + j))
+            elif state == 1:
+                i -= 1
+                state = 0 if matrix[i][0][j] - self.gap_open == value else 1
+                steps.append(('delete', i0 + i, j0 + j))
+            else:
+                j -= 1
+                state = 0 if matrix[i][0][j] - self.gap_open == value else 2
+                steps.append(('insert', i0 + i, j0 + j))
+        steps.reverse()
+        return steps
+
+
 class NeedlemanWunsch(_BaseSimilarity):
     """
     Computes the Needleman-Wunsch measure between two strings.
@@ -428,6 +1640,23 @@ class NeedlemanWunsch(_BaseSimilarity):
     An alignment between two strings is a set of correspondences between the
     characters of between them, allowing for gaps.
 
+    Instead of `sim_func` a substitution matrix (like BLOSUM) can be passed
+    as `sim_matrix`: a `Matrix`, a mapping of pairs of elements to scores,
+    or a square 2-D array indexed by positions of elements in `alphabet`.
+    It is compiled once, and sequences are encoded into integer arrays,
+    so no Python function is called for the alignment cells.
+
+    Only the score is calculated, so only a few rows or anti-diagonals
+    of the matrix are kept in memory. numpy is optional: it vectorizes
+    long sequences, and `dtype` (like `numpy.float32`) is the type of its arrays.
+    The same is supported by `SmithWaterman` and `Gotoh`.
+
+    If `band` is passed, only alignments that go no further than `band` cells
+    from the main diagonal (widened by the length difference) are considered,
+    which takes O(band * n) time instead of O(n * m). For similar sequences,
+    like revisions of one text, it is the same score for a small band.
+    It is supported by `Gotoh` too.
+
     https://en.wikipedia.org/wiki/Needleman%E2%80%93Wunsch_algorithm
     """
 
@@ -437,9 +1666,18 @@ class NeedlemanWunsch(_BaseSimilarity):
         sim_func: SimFunc = None,
         qval: int = 1,
         external: bool = True,
+        sim_matrix: Any = None,
+        alphabet: Iterable[Any] | None = None,
+        dtype: Any = float,
+        band: int | None = None,
     ) -> None:
         self.qval = qval
         self.gap_cost = gap_cost
+        sim_func, self._alphabet, self._table = _scoring(sim_func, sim_matrix, alphabet)
+        self.dtype = dtype
+        if band is not None and band < 0:
+            raise ValueError('band can not be negative')
+        self.band = band
         if sim_func:
             self.sim_func = sim_func
         else:
@@ -452,57 +1690,149 @@ class NeedlemanWunsch(_BaseSimilarity):
     def maximum(self, *sequences: Sequence[object]) -> float:
         return max(map(len, sequences))
 
-    def distance(self, *sequences: Sequence[object]) -> float:
+    def distance(self, *sequences: Sequence[object], max_distance: float | None = None) -> float:
         """Get distance between sequences
+
+        If the distance is greater than `max_distance`, `max_distance + 1` is returned.
         """
-        return -1 * self.similarity(*sequences)
+        distance = -1 * self.similarity(*sequences)
+        if max_distance is not None and distance > max_distance:
+            return max_distance + 1
+        return distance
 
-    def normalized_distance(self, *sequences: Sequence[object]) -> float:
+    def normalized_distance(self, *sequences: Sequence[object], max_distance: float | None = None) -> float:
         """Get distance from 0 to 1
+
+        If the normalized distance is greater than `max_distance`, 1 is returned.
         """
         minimum = self.minimum(*sequences)
         maximum = self.maximum(*sequences)
         if maximum == 0:
             return 0
-        return (self.distance(*sequences) - minimum) / (maximum - minimum)
+        distance = (self.distance(*sequences) - minimum) / (maximum - minimum)
+        if max_distance is not None and distance > max_distance:
+            return 1
+        return distance
 
-    def normalized_similarity(self, *sequences: Sequence[object]) -> float:
+    def normalized_similarity(self, *sequences: Sequence[object], max_distance: float | None = None) -> float:
         """Get similarity from 0 to 1
+
+        If `1 - normalized_similarity` is greater than `max_distance`, 0 is returned.
         """
         minimum = self.minimum(*sequences)
         maximum = self.maximum(*sequences)
         if maximum == 0:
             return 1
-        return (self.similarity(*sequences) - minimum) / (maximum * 2)
+        similarity = (self.similarity(*sequences) - minimum) / (maximum * 2)
+        if max_distance is not None and 1 - similarity > max_distance:
+            return 0
+        return similarity
 
-    def __call__(self, s1: Sequence[T], s2: Sequence[T]) -> float:
-        if not numpy:
-            raise ImportError('Please, install numpy for Needleman-Wunsch measure')
+    def _numpy(self, s1: Sequence[T], s2: Sequence[T]) -> float:
+        """
+        Wavefront algorithm: every anti-diagonal of the matrix depends only
+        on the two previous ones, so it is calculated by a few vector operations
+        over integer-encoded sequences. Only three diagonals are stored.
+        Elements must be hashable.
+        """
+        len1 = len(s1)
+        len2 = len(s2)
+        codes1, codes2, table = _score_table(s1, s2, self.sim_func, self._alphabet, self._table, self.dtype)
+        lo, hi = _band_limits(len1, len2, self.band)
+        inf = float('-inf')
+        prev2 = numpy.zeros(len1 + 1, dtype=self.dtype)
+        prev = numpy.zeros(len1 + 1, dtype=self.dtype)
+        cur = numpy.zeros(len1 + 1, dtype=self.dtype)
+        for d, cells, rows, cols in _anti_diagonals(len1, len2, self.band):
+            # cells right out of the band
+            cur[cells.start - 1] = inf
+            if cells.stop <= len1:
+                cur[cells.stop] = inf
+            # the first row and the first column
+            if d <= min(len2, hi):
+                cur[0] = -(d * self.gap_cost)
+            if d <= min(len1, -lo):
+                cur[d] = -(d * self.gap_cost)
+            match = prev2[rows] + table[codes1[rows], codes2[cols]]
+            numpy.maximum(match, prev[rows] - self.gap_cost, out=match)
+            numpy.maximum(match, prev[cells] - self.gap_cost, out=match)
+            cur[cells] = match
+            prev2, prev, cur = prev, cur, prev2
+        return float(prev[len1])
+
+    def _pure_python(self, s1: Sequence[T], s2: Sequence[T]) -> float:
+        """
+        Only the previous and the current rows of the matrix are stored.
+        """
+        gap = self.gap_cost
+        len2 = len(s2)
+        lo, hi = _band_limits(len(s1), len2, self.band)
+        inf = float('-inf')
+        prev = [-float(j * gap) if j <= hi else inf for j in range(len2 + 1)]
+        cur = [inf] * (len2 + 1)
+        for i, c1 in enumerate(s1, 1):
+            low = max(1, i + lo)
+            high = min(len2, i + hi)
+            # the first column or the cell right out of the band
+            cur[low - 1] = -float(i * gap) if low == 1 and -i >= lo else inf
+            for j in range(low, high + 1):
+                match = prev[j - 1] + self.sim_func(c1, s2[j - 1])
+                delete = prev[j] - gap
+                insert = cur[j - 1] - gap
+                cur[j] = max(match, delete, insert)
+            if high < len2:
+                cur[high + 1] = inf
+            prev, cur = cur, prev
+        return prev[len2]
 
+    def __call__(self, s1: Sequence[T], s2: Sequence[T]) -> float:
         s1, s2 = self._get_sequences(s1, s2)
 
         # result = self.quick_answer(s1, s2)
         # if result is not None:
         #     return result * self.maximum(s1, s2)
 
-        dist_mat = numpy.zeros(
-            (len(s1) + 1, len(s2) + 1),
-            dtype=float,
-        )
-        # DP initialization
-        for i in range(len(s1) + 1):
-            dist_mat[i, 0] = -(i * self.gap_cost)
-        # DP initialization
-        for j in range(len(s2) + 1):
-            dist_mat[0, j] = -(j * self.gap_cost)
-        # Needleman-Wunsch DP calculation
-        for i, c1 in enumerate(s1, 1):
-            for j, c2 in enumerate(s2, 1):
-                match = dist_mat[i - 1, j - 1] + self.sim_func(c1, c2)
-                delete = dist_mat[i - 1, j] - self.gap_cost
-                insert = dist_mat[i, j - 1] - self.gap_cost
-                dist_mat[i, j] = max(match, delete, insert)
-        return dist_mat[dist_mat.shape[0] - 1, dist_mat.shape[1] - 1]
+        # with the default sim_func a common prefix and suffix score 1 per element
+        # and are always in the best alignment if gaps aren't rewarded.
+        matched = 0
+        if self.sim_func is self._ident and self.gap_cost >= 0:
+            prefix, suffix = self._common_affix(s1, s2)
+            s1 = s1[prefix:len(s1) - suffix]
+            s2 = s2[prefix:len(s2) - suffix]
+            matched = prefix + suffix
+
+        if _use_wavefront(len(s1), len(s2), self.band):
+            with suppress(TypeError):  # unhashable elements
+                return self._numpy(s1, s2) + matched
+        return self._pure_python(s1, s2) + matched
+
+    def _aligner(self) -> _Aligner:
+        return _Aligner(self.sim_func, self.gap_cost)
+
+    def _steps(self, s1: Sequence[T], s2: Sequence[T]) -> list[tuple[str, int, int]]:
+        return self._aligner().steps(s1, s2)
+
+    def align(self, s1: Sequence[T], s2: Sequence[T], gap: Any = '-') -> tuple[Sequence[Any], Sequence[Any]]:
+        """Get the optimal alignment of the sequences.
+
+        Returns both sequences with `gap` in place of the missed elements:
+        strings for strings and lists for other sequences.
+        Hirschberg's algorithm is used, so memory usage is linear.
+        `band` is not used for the alignment.
+        """
+        s1, s2 = self._get_sequences(s1, s2)
+        return _aligned(s1, s2, self._steps(s1, s2), gap)
+
+    def opcodes(self, s1: Sequence[T], s2: Sequence[T]) -> list[tuple[str, int, int, int, int]]:
+        """Get the optimal alignment as `difflib.SequenceMatcher.get_opcodes` does.
+
+        Every opcode is a tuple `(tag, i1, i2, j1, j2)` describing that
+        `s1[i1:i2]` is aligned to `s2[j1:j2]` ("equal" or "replace"),
+        deleted ("delete"), or `s2[j1:j2]` is inserted ("insert"),
+        like the runs of a CIGAR string.
+        """
+        s1, s2 = self._get_sequences(s1, s2)
+        return _opcodes(self._steps(s1, s2))
 
 
 class SmithWaterman(_BaseSimilarity):
@@ -523,40 +1853,472 @@ class SmithWaterman(_BaseSimilarity):
         sim_func: SimFunc = None,
         qval: int = 1,
         external: bool = True,
+        sim_matrix: Any = None,
+        alphabet: Iterable[Any] | None = None,
+        dtype: Any = float,
     ) -> None:
         self.qval = qval
         self.gap_cost = gap_cost
+        sim_func, self._alphabet, self._table = _scoring(sim_func, sim_matrix, alphabet)
+        self.dtype = dtype
         self.sim_func = sim_func or self._ident
         self.external = external
 
     def maximum(self, *sequences: Sequence[object]) -> int:
         return min(map(len, sequences))
 
-    def __call__(self, s1: Sequence[T], s2: Sequence[T]) -> float:
-        if not numpy:
-            raise ImportError('Please, install numpy for Smith-Waterman measure')
+    def _numpy(self, s1: Sequence[T], s2: Sequence[T]) -> float:
+        """
+        Wavefront algorithm, see `NeedlemanWunsch._numpy`.
+        """
+        len1 = len(s1)
+        len2 = len(s2)
+        codes1, codes2, table = _score_table(s1, s2, self.sim_func, self._alphabet, self._table, self.dtype)
+        prev2 = numpy.zeros(len1 + 1, dtype=self.dtype)
+        prev = numpy.zeros(len1 + 1, dtype=self.dtype)
+        cur = numpy.zeros(len1 + 1, dtype=self.dtype)
+        for _, cells, rows, cols in _anti_diagonals(len1, len2):
+            match = prev2[rows] + table[codes1[rows], codes2[cols]]
+            numpy.maximum(match, 0, out=match)
+            numpy.maximum(match, prev[rows] - self.gap_cost, out=match)
+            numpy.maximum(match, prev[cells] - self.gap_cost, out=match)
+            cur[cells] = match
+            prev2, prev, cur = prev, cur, prev2
+        return float(prev[len1])
+
+    def _pure_python(self, s1: Sequence[T], s2: Sequence[T]) -> float:
+        """
+        Only the previous and the current rows of the matrix are stored.
+        """
+        gap = self.gap_cost
+        prev = [0.0] * (len(s2) + 1)
+        for c1 in s1:
+            cur = [0.0]
+            for j, c2 in enumerate(s2, 1):
+                # The score for substituting the letter a[i - 1] for b[j - 1].
+                # Generally low for mismatch, high for match.
+                match = prev[j - 1] + self.sim_func(c1, c2)
+                # The scores for for introducing extra letters in one of the strings
+                # (or by symmetry, deleting them from the other).
+                delete = prev[j] - gap
+                insert = cur[j - 1] - gap
+                cur.append(max(0.0, match, delete, insert))
+            prev = cur
+        return prev[-1]
 
+    def __call__(self, s1: Sequence[T], s2: Sequence[T]) -> float:
         s1, s2 = self._get_sequences(s1, s2)
 
         result = self.quick_answer(s1, s2)
         if result is not None:
             return result
 
-        dist_mat = numpy.zeros(
-            (len(s1) + 1, len(s2) + 1),
-            dtype=float,
-        )
-        for i, sc1 in enumerate(s1, start=1):
-            for j, sc2 in enumerate(s2, start=1):
-                # The score for substituting the letter a[i - 1] for b[j - 1].
-                # Generally low for mismatch, high for match.
-                match = dist_mat[i - 1, j - 1] + self.sim_func(sc1, sc2)
-                # The scores for for introducing extra letters in one of the strings
-                # (or by symmetry, deleting them from the other).
-                delete = dist_mat[i - 1, j] - self.gap_cost
-                insert = dist_mat[i, j - 1] - self.gap_cost
-                dist_mat[i, j] = max(0, match, delete, insert)
-        return dist_mat[dist_mat.shape[0] - 1, dist_mat.shape[1] - 1]
+        if _use_wavefront(len(s1), len(s2)):
+            with suppress(TypeError):  # unhashable elements
+                return self._numpy(s1, s2)
+        return self._pure_python(s1, s2)
+
+    def _rows(self, s1: Sequence[T], s2: Sequence[T]) -> Iterator[list[float]]:
+        """Rows of the matrix.
+        """
+        sim_func = self.sim_func
+        gap = self.gap_cost
+        row = [0.0] * (len(s2) + 1)
+        yield row
+        for c1 in s1:
+            left = 0.0
+            cur = [left]
+            for c2, diagonal, up in zip(s2, row, row[1:]):
+                left = max(0.0, diagonal + sim_func(c1, c2), up - gap, left - gap)
+                cur.append(left)
+            row = cur
+            yield row
+
+    def _best_cell(self, s1: Sequence[T], s2: Sequence[T]) -> tuple[float, int, int]:
+        """The best local alignment score in the matrix and its cell.
+        """
+        best = (0.0, 0, 0)
+        for i, row in enumerate(self._rows(s1, s2)):
+            top = max(row)
+            if top > best[0]:
+                best = (top, i, row.index(top))
+        return best
+
+    def _best_start(self, s1: Sequence[T], s2: Sequence[T]) -> tuple[int, int]:
+        """Where the best alignment ending at the ends of the sequences starts.
+
+        Global alignment scores of all suffixes are calculated
+        by the backward pass over the matrix.
+        """
+        sim_func = self.sim_func
+        gap = self.gap_cost
+        best = (0.0, len(s1), len(s2))
+        row = [-float(j * gap) for j in range(len(s2) + 1)]
+        for i, c1 in enumerate(reversed(s1), 1):
+            left = -float(i * gap)
+            cur = [left]
+            for c2, diagonal, up in zip(reversed(s2), row, row[1:]):
+                left = max(diagonal + sim_func(c1, c2), up - gap, left - gap)
+                cur.append(left)
+            top = max(cur)
+            if top > best[0]:
+                best = (top, len(s1) - i, len(s2) - cur.index(top))
+            row = cur
+        return best[1], best[2]
+
+    def _steps(self, s1: Sequence[T], s2: Sequence[T]) -> list[tuple[str, int, int]]:
+        score, i2, j2 = self._best_cell(s1, s2)
+        if not score:
+            return []
+        i1, j1 = self._best_start(s1[:i2], s2[:j2])
+        aligner = _Aligner(self.sim_func, self.gap_cost)
+        return aligner.steps(s1[i1:i2], s2[j1:j2], i1, j1)
+
+    def _cell(
+        self,
+        matrix: list[list[float]],
+        s1: Sequence[T],
+        s2: Sequence[T],
+        forbidden: set[tuple[int, int]],
+        i: int,
+        j: int,
+    ) -> float:
+        """Calculate the cell of the matrix where `forbidden` cells can't be aligned pairs.
+        """
+        score = max(0.0, matrix[i - 1][j] - self.gap_cost, matrix[i][j - 1] - self.gap_cost)
+        if (i, j) not in forbidden:
+            score = max(score, matrix[i - 1][j - 1] + self.sim_func(s1[i - 1], s2[j - 1]))
+        return score
+
+    def _local_traceback(
+        self,
+        matrix: list[list[float]],
+        s1: Sequence[T],
+        s2: Sequence[T],
+        forbidden: set[tuple[int, int]],
+        i: int,
+        j: int,
+    ) -> list[tuple[str, int, int]]:
+        """Steps of the local alignment ending in the cell `(i, j)`.
+        """
+        gap = self.gap_cost
+        steps = []
+        while matrix[i][j] > 0:
+            value = matrix[i][j]
+            if (i, j) not in forbidden and matrix[i - 1][j - 1] + self.sim_func(s1[i - 1], s2[j - 1]) == value:
+                i -= 1
+                j -= 1
+                steps.append(('equal' if s1[i] == s2[j] else 'replace', i, j))
+            elif matrix[i - 1][j] - gap == value:
+                i -= 1
+                steps.append(('delete', i, j))
+            else:
+                j -= 1
+                steps.append(('insert', i, j))
+        steps.reverse()
+        return steps
+
+    def top_alignments(
+        self,
+        s1: Sequence[T],
+        s2: Sequence[T],
+        n: int,
+    ) -> list[tuple[float, list[tuple[str, int, int, int, int]]]]:
+        """Get up to `n` best local alignments that don't share aligned pairs of elements.
+
+        Waterman-Eggert algorithm: pairs of every found alignment can't be aligned
+        again, and only the cells depending on them are recalculated,
+        row by row until the values stop changing.
+        The whole matrix is stored, so memory usage is O(len(s1) * len(s2)).
+
+        Every alignment is its score and opcodes, see `opcodes`.
+        Alignments are sorted by score. There are less than `n` of them
+        if no alignments with a positive score are left.
+        """
+        s1, s2 = self._get_sequences(s1, s2)
+        matrix = list(self._rows(s1, s2))
+        row_tops = [max(row) for row in matrix]
+        forbidden: set[tuple[int, int]] = set()
+        result: list[tuple[float, list[tuple[str, int, int, int, int]]]] = []
+        while len(result) < n:
+            score = max(row_tops)
+            if score <= 0:
+                break
+            i = row_tops.index(score)
+            steps = self._local_traceback(matrix, s1, s2, forbidden, i, matrix[i].index(score))
+            result.append((score, _opcodes(steps)))
+
+            # forbid aligned pairs and recalculate cells that depend on them
+            pairs = defaultdict(list)
+            for tag, i, j in steps:
+                if tag in ('equal', 'replace'):
+                    forbidden.add((i + 1, j + 1))
+                    pairs[i + 1].append(j + 1)
+            last_row = max(pairs)
+            changed: list[int] = []
+            for i in range(min(pairs), len(s1) + 1):
+                todo = set(pairs.get(i, ()))
+                todo.update(changed)
+                todo.update(j + 1 for j in changed if j < len(s2))
+                if not todo:
+                    if i >= last_row:
+                        break
+                    continue
+                last = max(todo)
+                row = matrix[i]
+                changed = []
+                for j in range(min(todo), len(s2) + 1):
+                    if not (changed and changed[-1] == j - 1 or j in todo):
+                        if j > last:
+                            break
+                        continue
+                    value = self._cell(matrix, s1, s2, forbidden, i, j)
+                    if value != row[j]:
+                        row[j] = value
+                        changed.append(j)
+                if changed:
+                    row_tops[i] = max(row)
+        return result
+
+    def _xdrop(self, s1: Sequence[T], s2: Sequence[T], xdrop: float) -> tuple[float, int, int]:
+        """X-drop extension of the alignment starting at the beginning of both sequences.
+
+        Only the live part of every row is stored and calculated.
+        Returns the best score and the lengths of the aligned prefixes.
+        """
+        sim_func = self.sim_func
+        gap = self.gap_cost
+        inf = float('-inf')
+        best = (0.0, 0, 0)
+        # the first row: only insertions
+        row = [0.0]
+        while len(row) <= len(s2) and row[-1] - gap >= -xdrop:
+            row.append(row[-1] - gap)
+        # the column of the first cell in the row
+        low = 0
+        for i, c1 in enumerate(s1, 1):
+            floor = best[0] - xdrop
+            high = low + len(row)
+            cur = []
+            left = inf
+            for j in range(low, len(s2) + 1):
+                score = left - gap
+                if j < high:
+                    score = max(score, row[j - low] - gap)
+                if low < j <= high:
+                    score = max(score, row[j - 1 - low] + sim_func(c1, s2[j - 1]))
+                if score < floor:
+                    # only insertions are possible right of the previous row
+                    if j >= high:
+                        break
+                    score = inf
+                cur.append(score)
+                left = score
+
+            # drop dead cells from both ends of the row
+            start = 0
+            while start < len(cur) and cur[start] == inf:
+                start += 1
+            if start == len(cur):
+                break
+            end = len(cur)
+            while cur[end - 1] == inf:
+                end -= 1
+            low += start
+            row = cur[start:end]
+            top = max(row)
+            if top > best[0]:
+                best = (top, i, low + row.index(top))
+        return best
+
+    def extend(
+        self,
+        s1: Sequence[T],
+        s2: Sequence[T],
+        i: int,
+        j: int,
+        xdrop: float,
+    ) -> tuple[float, int, int, int, int]:
+        """Extend a local alignment from the seed position in both directions.
+
+        The alignment goes through the seed: `s1[:i]` and `s2[:j]` are aligned
+        before it, `s1[i:]` and `s2[j:]` after it. Cells of the matrix
+        with a score more than `xdrop` below the best one are dropped,
+        and the extension stops when a whole row is dropped,
+        so the time is proportional to the aligned region instead of the whole
+        matrix. It needs scoring where unrelated elements lose score,
+        like `sim_func` returning 1 for matches and -3 for mismatches.
+
+        Returns the approximate best score and the aligned region
+        `(score, i1, i2, j1, j2)`, that is `s1[i1:i2]` aligned to `s2[j1:j2]`.
+        """
+        s1, s2 = self._get_sequences(s1, s2)
+        if not 0 <= i <= len(s1) or not 0 <= j <= len(s2):
+            raise ValueError('seed position is out of sequences')
+        if xdrop < 0:
+            raise ValueError('xdrop must not be negative')
+        forward, forward1, forward2 = self._xdrop(s1[i:], s2[j:], xdrop)
+        backward, backward1, backward2 = self._xdrop(s1[:i][::-1], s2[:j][::-1], xdrop)
+        return forward + backward, i - backward1, i + forward1, j - backward2, j + forward2
+
+    def _banded(self, s1: Sequence[T], s2: Sequence[T], low: int, high: int) -> tuple[float, int, int, int, int]:
+        """Get the best local alignment within the diagonals `low <= j - i <= high`.
+
+        Cells outside the band are zeros. Every cell keeps where its alignment starts,
+        so the region is found in one pass without storing the matrix.
+        Returns `(score, i1, i2, j1, j2)`.
+        """
+        sim_func = self.sim_func
+        gap = self.gap_cost
+        len2 = len(s2)
+        best: tuple[float, int, int, int, int] = (0, 0, 0, 0, 0)
+        prev: list[float] = []
+        prev_starts: list[tuple[int, int]] = []
+        prev_low = 0
+        for i in range(max(1, -high), min(len(s1), len2 - low) + 1):
+            c1 = s1[i - 1]
+            row_low = max(0, i + low)
+            row: list[float] = []
+            starts: list[tuple[int, int]] = []
+            for j in range(row_low, min(len2, i + high) + 1):
+                score: float = 0
+                start = (i, j)
+                if j:
+                    k = j - 1 - prev_low
+                    if 0 <= k < len(prev):
+                        diagonal, diagonal_start = prev[k], prev_starts[k]
+                    else:
+                        diagonal, diagonal_start = 0, (i - 1, j - 1)
+                    value = diagonal + sim_func(c1, s2[j - 1])
+                    if value > score:
+                        score, start = value, diagonal_start
+                k = j - prev_low
+                if 0 <= k < len(prev) and prev[k] - gap > score:
+                    score, start = prev[k] - gap, prev_starts[k]
+                if j > row_low and row[-1] - gap > score:
+                    score, start = row[-1] - gap, starts[-1]
+                row.append(score)
+                starts.append(start)
+                if score > best[0]:
+                    best = (score, start[0], i, start[1], j)
+            prev, prev_starts, prev_low = row, starts, row_low
+        return best
+
+    def align(self, s1: Sequence[T], s2: Sequence[T], gap: Any = '-') -> tuple[Sequence[Any], Sequence[Any]]:
+        """Get the best local alignment of the sequences.
+
+        Returns the aligned parts of both sequences with `gap`
+        in place of the missed elements: strings for strings and lists for
+        other sequences. It is the best alignment anywhere in the sequences,
+        so its score can be greater than the measure that is the score
+        of the alignment ending at the ends of both sequences.
+        Only linear memory is used.
+        """
+        s1, s2 = self._get_sequences(s1, s2)
+        return _aligned(s1, s2, self._steps(s1, s2), gap)
+
+    def opcodes(self, s1: Sequence[T], s2: Sequence[T]) -> list[tuple[str, int, int, int, int]]:
+        """Get the best local alignment as `difflib.SequenceMatcher.get_opcodes` does.
+
+        See `NeedlemanWunsch.opcodes`. Only the aligned parts of the sequences
+        are covered: from `i1` and `j1` of the first opcode
+        to `i2` and `j2` of the last one.
+        """
+        s1, s2 = self._get_sequences(s1, s2)
+        return _opcodes(self._steps(s1, s2))
+
+
+class SmithWatermanIndex:
+    """
+    Index of documents for the local alignment search in the style of BLAST.
+
+    Every document is indexed by its q-grams of length `k`. Q-grams of the query
+    found in a document are seeds, and seeds on close diagonals are grouped.
+    Only documents with enough seeds are aligned, and only within the band
+    of diagonals around the seeds, so the search doesn't run Smith-Waterman
+    for every document and every pair of elements.
+    Hits with no common q-gram with the query are never found.
+
+    https://en.wikipedia.org/wiki/BLAST_(biotechnology)
+    """
+
+    def __init__(
+        self,
+        documents: Iterable[Sequence[object]],
+        k: int = 4,
+        algorithm: SmithWaterman | None = None,
+    ) -> None:
+        self.documents = list(documents)
+        self.k = k
+        self.algorithm = algorithm or SmithWaterman()
+        if k < 1:
+            raise ValueError('k must be positive')
+
+        self._table: dict[tuple, list[tuple[int, int]]] = defaultdict(list)
+        for index, document in enumerate(self.documents):
+            for j, qgram in enumerate(find_ngrams(document, k)):
+                self._table[qgram].append((index, j))
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def _seeds(self, query: Sequence[object]) -> dict[int, Counter[int]]:
+        """Count seeds in every document by diagonals `j - i`.
+        """
+        seeds: dict[int, Counter[int]] = defaultdict(Counter)
+        for i, qgram in enumerate(find_ngrams(query, self.k)):
+            for index, j in self._table.get(qgram, ()):
+                seeds[index][j - i] += 1
+        return seeds
+
+    @staticmethod
+    def _groups(diagonals: Counter[int], band: int) -> list[list[int]]:
+        """Group diagonals not farther than `band` from each other.
+
+        Returns the lowest diagonal, the highest one, and the count of seeds
+        for every group.
+        """
+        groups: list[list[int]] = []
+        for diagonal in sorted(diagonals):
+            if groups and diagonal - groups[-1][1] <= band:
+                groups[-1][1] = diagonal
+                groups[-1][2] += diagonals[diagonal]
+            else:
+                groups.append([diagonal, diagonal, diagonals[diagonal]])
+        return groups
+
+    def search(
+        self,
+        query: Sequence[object],
+        n: int = 10,
+        band: int = 8,
+        min_seeds: int = 1,
+    ) -> list[tuple[float, int, int, int, int, int]]:
+        """Get the top `n` hits for `query` as `(score, index, i1, i2, j1, j2)`.
+
+        A hit is the best local alignment of `query[i1:i2]` and `documents[index][j1:j2]`
+        found around the seeds of the document. Smith-Waterman runs
+        for every group of at least `min_seeds` seeds, widened by `band` diagonals
+        to both sides. Hits are sorted by score, best first,
+        with at most one hit for every document.
+        """
+        if band < 0:
+            raise ValueError('band must not be negative')
+        hits = []
+        for index, diagonals in self._seeds(query).items():
+            document = self.documents[index]
+            best = None
+            for low, high, count in self._groups(diagonals, band):
+                if count < min_seeds:
+                    continue
+                hit = self.algorithm._banded(query, document, low - band, high + band)
+                if best is None or hit[0] > best[0]:
+                    best = hit
+            if best is not None and best[0] > 0:
+                score, i1, i2, j1, j2 = best
+                hits.append((score, index, i1, i2, j1, j2))
+        hits.sort(key=lambda hit: (-hit[0], hit[1]))
+        return hits[:n]
 
 
 class Gotoh(NeedlemanWunsch):
@@ -573,10 +2335,19 @@ class Gotoh(NeedlemanWunsch):
         sim_func: SimFunc = None,
         qval: int = 1,
         external: bool = True,
+        sim_matrix: Any = None,
+        alphabet: Iterable[Any] | None = None,
+        dtype: Any = float,
+        band: int | None = None,
     ) -> None:
         self.qval = qval
         self.gap_open = gap_open
         self.gap_ext = gap_ext
+        sim_func, self._alphabet, self._table = _scoring(sim_func, sim_matrix, alphabet)
+        self.dtype = dtype
+        if band is not None and band < 0:
+            raise ValueError('band can not be negative')
+        self.band = band
         if sim_func:
             self.sim_func = sim_func
         else:
@@ -589,55 +2360,105 @@ class Gotoh(NeedlemanWunsch):
     def maximum(self, *sequences: Sequence[object]) -> int:
         return min(map(len, sequences))
 
-    def __call__(self, s1: Sequence[T], s2: Sequence[T]) -> float:
-        if not numpy:
-            raise ImportError('Please, install numpy for Gotoh measure')
+    def _numpy(self, s1: Sequence[T], s2: Sequence[T]) -> float:
+        """
+        Wavefront algorithm, see `NeedlemanWunsch._numpy`.
+        All three matrices are stored as three anti-diagonals each.
+        """
+        len1 = len(s1)
+        len2 = len(s2)
+        codes1, codes2, table = _score_table(s1, s2, self.sim_func, self._alphabet, self._table, self.dtype)
+        inf = float('-inf')
+        d_prev2, d_prev, d_cur = (numpy.full(len1 + 1, inf, dtype=self.dtype) for _ in range(3))
+        p_prev2, p_prev, p_cur = (numpy.full(len1 + 1, inf, dtype=self.dtype) for _ in range(3))
+        q_prev2, q_prev, q_cur = (numpy.full(len1 + 1, inf, dtype=self.dtype) for _ in range(3))
+        d_prev[0] = 0
+        lo, hi = _band_limits(len1, len2, self.band)
+        for d, cells, rows, cols in _anti_diagonals(len1, len2, self.band):
+            # cells right out of the band
+            d_cur[cells.start - 1] = p_cur[cells.start - 1] = q_cur[cells.start - 1] = inf
+            if cells.stop <= len1:
+                d_cur[cells.stop] = p_cur[cells.stop] = q_cur[cells.stop] = inf
+            # the first row and the first column
+            if d <= min(len2, hi):
+                q_cur[0] = -self.gap_open - self.gap_ext * (d - 1)
+            if d <= min(len1, -lo):
+                p_cur[d] = -self.gap_open - self.gap_ext * (d - 1)
+
+            sim_val = table[codes1[rows], codes2[cols]]
+            match = d_prev2[rows] + sim_val
+            numpy.maximum(match, p_prev2[rows] + sim_val, out=match)
+            numpy.maximum(match, q_prev2[rows] + sim_val, out=match)
+            d_cur[cells] = match
+            p_cur[cells] = numpy.maximum(d_prev[rows] - self.gap_open, p_prev[rows] - self.gap_ext)
+            q_cur[cells] = numpy.maximum(d_prev[cells] - self.gap_open, q_prev[cells] - self.gap_ext)
+
+            d_prev2, d_prev, d_cur = d_prev, d_cur, d_prev2
+            p_prev2, p_prev, p_cur = p_prev, p_cur, p_prev2
+            q_prev2, q_prev, q_cur = q_prev, q_cur, q_prev2
+        return float(max(d_prev[len1], p_prev[len1], q_prev[len1]))
+
+    def _pure_python(self, s1: Sequence[T], s2: Sequence[T]) -> float:
+        """
+        Only the previous and the current rows of the three matrices are stored.
+        """
+        len2 = len(s2)
+        lo, hi = _band_limits(len(s1), len2, self.band)
+        inf = float('-inf')
+        d_prev = [0.0] + [inf] * len2
+        p_prev = [inf] * (len2 + 1)
+        q_prev = [inf] + [
+            -self.gap_open - self.gap_ext * (j - 1) if j <= hi else inf
+            for j in range(1, len2 + 1)
+        ]
+        d_cur = [inf] * (len2 + 1)
+        p_cur = [inf] * (len2 + 1)
+        q_cur = [inf] * (len2 + 1)
+        for i, sc1 in enumerate(s1, start=1):
+            low = max(1, i + lo)
+            high = min(len2, i + hi)
+            # the first column or the cell right out of the band
+            d_cur[low - 1] = q_cur[low - 1] = inf
+            if low == 1 and -i >= lo:
+                p_cur[0] = -self.gap_open - self.gap_ext * (i - 1)
+            else:
+                p_cur[low - 1] = inf
+            for j in range(low, high + 1):
+                sim_val = self.sim_func(sc1, s2[j - 1])
+                d_cur[j] = max(
+                    d_prev[j - 1] + sim_val,
+                    p_prev[j - 1] + sim_val,
+                    q_prev[j - 1] + sim_val,
+                )
+                p_cur[j] = max(
+                    d_prev[j] - self.gap_open,
+                    p_prev[j] - self.gap_ext,
+                )
+                q_cur[j] = max(
+                    d_cur[j - 1] - self.gap_open,
+                    q_cur[j - 1] - self.gap_ext,
+                )
+            if high < len2:
+                d_cur[high + 1] = p_cur[high + 1] = q_cur[high + 1] = inf
+            d_prev, d_cur = d_cur, d_prev
+            p_prev, p_cur = p_cur, p_prev
+            q_prev, q_cur = q_cur, q_prev
+        return float(max(d_prev[len2], p_prev[len2], q_prev[len2]))
 
+    def __call__(self, s1: Sequence[T], s2: Sequence[T]) -> float:
         s1, s2 = self._get_sequences(s1, s2)
 
         # result = self.quick_answer(s1, s2)
         # if result is not None:
         #     return result * self.maximum(s1, s2)
 
-        len_s1 = len(s1)
-        len_s2 = len(s2)
-        d_mat = numpy.zeros((len_s1 + 1, len_s2 + 1), dtype=float)
-        p_mat = numpy.zeros((len_s1 + 1, len_s2 + 1), dtype=float)
-        q_mat = numpy.zeros((len_s1 + 1, len_s2 + 1), dtype=float)
-
-        d_mat[0, 0] = 0
-        p_mat[0, 0] = float('-inf')
-        q_mat[0, 0] = float('-inf')
-        for i in range(1, len_s1 + 1):
-            d_mat[i, 0] = float('-inf')
-            p_mat[i, 0] = -self.gap_open - self.gap_ext * (i - 1)
-            q_mat[i, 0] = float('-inf')
-            q_mat[i, 1] = -self.gap_open
-        for j in range(1, len_s2 + 1):
-            d_mat[0, j] = float('-inf')
-            p_mat[0, j] = float('-inf')
-            p_mat[1, j] = -self.gap_open
-            q_mat[0, j] = -self.gap_open - self.gap_ext * (j - 1)
+        if _use_wavefront(len(s1), len(s2), self.band):
+            with suppress(TypeError):  # unhashable elements
+                return self._numpy(s1, s2)
+        return self._pure_python(s1, s2)
 
-        for i, sc1 in enumerate(s1, start=1):
-            for j, sc2 in enumerate(s2, start=1):
-                sim_val = self.sim_func(sc1, sc2)
-                d_mat[i, j] = max(
-                    d_mat[i - 1, j - 1] + sim_val,
-                    p_mat[i - 1, j - 1] + sim_val,
-                    q_mat[i - 1, j - 1] + sim_val,
-                )
-                p_mat[i, j] = max(
-                    d_mat[i - 1, j] - self.gap_open,
-                    p_mat[i - 1, j] - self.gap_ext,
-                )
-                q_mat[i, j] = max(
-                    d_mat[i, j - 1] - self.gap_open,
-                    q_mat[i, j - 1] - self.gap_ext,
-                )
-
-        i, j = (n - 1 for n in d_mat.shape)
-        return max(d_mat[i, j], p_mat[i, j], q_mat[i, j])
+    def _aligner(self) -> _Aligner:
+        return _AffineAligner(self.sim_func, self.gap_open, self.gap_ext)
 
 
 class StrCmp95(_BaseSimilarity):
@@ -665,87 +2486,80 @@ class StrCmp95(_BaseSimilarity):
     def _in_range(char) -> bool:
         return 0 < ord(char) < 91
 
-    def __call__(self, s1: str, s2: str) -> float:
-        s1 = s1.strip().upper()
-        s2 = s2.strip().upper()
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _similar_chars(sp_mx: tuple[tuple[str, str], ...]) -> dict[str, frozenset[str]]:
+        """Get characters similar to every character, built once for every `sp_mx`.
 
+        They are used to give partial credit for characters that
+        may be errors due to known phonetic or character recognition errors.
+        A typical example is to match the letter "O" with the number "0"
+        """
+        similar: dict[str, set[str]] = defaultdict(set)
+        for c1, c2 in sp_mx:
+            if StrCmp95._in_range(c1) and StrCmp95._in_range(c2):
+                similar[c1].add(c2)
+                similar[c2].add(c1)
+        return {c: frozenset(chars) for c, chars in similar.items()}
+
+    def _compare(self, s1: str, s2: str) -> float:
         result = self.quick_answer(s1, s2)
         if result is not None:
             return result
 
         len_s1 = len(s1)
         len_s2 = len(s2)
-
-        adjwt = defaultdict(int)
-
-        # Initialize the adjwt array on the first call to the function only.
-        # The adjwt array is used to give partial credit for characters that
-        # may be errors due to known phonetic or character recognition errors.
-        # A typical example is to match the letter "O" with the number "0"
-        for c1, c2 in self.sp_mx:
-            adjwt[c1, c2] = 3
-            adjwt[c2, c1] = 3
-
-        if len_s1 > len_s2:
-            search_range = len_s1
-            minv = len_s2
-        else:
-            search_range = len_s2
-            minv = len_s1
-
-        # Blank out the flags
-        s1_flag = [0] * search_range
-        s2_flag = [0] * search_range
-        search_range = max(0, search_range // 2 - 1)
+        minv = min(len_s1, len_s2)
+        search_range = max(0, max(len_s1, len_s2) // 2 - 1)
 
         # Looking only within the search range, count and flag the matched pairs.
-        num_com = 0
-        yl1 = len_s2 - 1
+        # Positions of every character in s2 and the flags are bits of ints,
+        # the first not flagged position in the range is the lowest bit.
+        masks = self._get_masks(s2)
+        window = (1 << (search_range + 1)) - 1
+        s1_flags = s2_flags = 0
         for i, sc1 in enumerate(s1):
-            lowlim = max(i - search_range, 0)
-            hilim = min(i + search_range, yl1)
-            for j in range(lowlim, hilim + 1):
-                if s2_flag[j] == 0 and s2[j] == sc1:
-                    s2_flag[j] = 1
-                    s1_flag[i] = 1
-                    num_com += 1
-                    break
+            candidates = masks.get(sc1, 0) & window & ~s2_flags
+            if candidates:
+                s2_flags |= candidates & -candidates
+                s1_flags |= 1 << i
+            window <<= 1
+            if i < search_range:
+                window |= 1
+        num_com = bin(s1_flags).count('1')
 
         # If no characters in common - return
         if num_com == 0:
             return 0.0
 
         # Count the number of transpositions
-        k = n_trans = 0
+        n_trans = 0
+        flags = s2_flags
         for i, sc1 in enumerate(s1):
-            if not s1_flag[i]:
+            if not s1_flags >> i & 1:
                 continue
-            for j in range(k, len_s2):
-                if s2_flag[j] != 0:
-                    k = j + 1
-                    break
-            if sc1 != s2[j]:
+            lowest = flags & -flags
+            if not masks[sc1] & lowest:
                 n_trans += 1
+            flags ^= lowest
         n_trans = n_trans // 2
 
         # Adjust for similarities in unmatched characters
         n_simi = 0
         if minv > num_com:
-            for i in range(len_s1):
-                if s1_flag[i] != 0:
+            similar = self._similar_chars(self.sp_mx)
+            unmatched = {c: mask & ~s2_flags for c, mask in masks.items()}
+            for i, sc1 in enumerate(s1):
+                if s1_flags >> i & 1:
                     continue
-                if not self._in_range(s1[i]):
+                candidates = 0
+                for sc2 in similar.get(sc1, ()):
+                    candidates |= unmatched.get(sc2, 0)
+                if not candidates:
                     continue
-                for j in range(len_s2):
-                    if s2_flag[j] != 0:
-                        continue
-                    if not self._in_range(s2[j]):
-                        continue
-                    if (s1[i], s2[j]) not in adjwt:
-                        continue
-                    n_simi += adjwt[s1[i], s2[j]]
-                    s2_flag[j] = 2
-                    break
+                lowest = candidates & -candidates
+                n_simi += 3
+                unmatched[s2[lowest.bit_length() - 1]] ^= lowest
         num_sim = n_simi / 10.0 + num_com
 
         # Main weight computation
@@ -787,6 +2601,16 @@ class StrCmp95(_BaseSimilarity):
         weight += (1.0 - weight) * res
         return weight
 
+    def __call__(self, s1: str, s2: str) -> float:
+        return self._compare(s1.strip().upper(), s2.strip().upper())
+
+    def compile(self, query: str) -> Callable[[str], float]:
+        s1 = query.strip().upper()
+
+        def compiled(s2: str) -> float:
+            return self._compare(s1, s2.strip().upper())
+        return compiled
+
 
 class MLIPNS(_BaseSimilarity):
     """
@@ -796,6 +2620,7 @@ class MLIPNS(_BaseSimilarity):
     http://www.sial.iias.spb.su/files/386-386-1-PB.pdf
     https://github.com/Yomguithereal/talisman/blob/master/src/metrics/mlipns.js
     """
+    _hamming = Hamming(external=False)
 
     def __init__(
         self, threshold: float = 0.25,
@@ -811,6 +2636,15 @@ class MLIPNS(_BaseSimilarity):
     def maximum(self, *sequences: Sequence[object]) -> int:
         return 1
 
+    def _decide(self, ham: int, maxlen: int) -> int:
+        if self.maxmismatches < 0:
+            return 0
+        # every allowed mismatch is skipped by decreasing both the distance
+        # and the length by one, so the ratio is the lowest with all of them skipped
+        if maxlen <= self.maxmismatches + 1:
+            return 1
+        return int(1 - (maxlen - ham) / (maxlen - self.maxmismatches) <= self.threshold)
+
     def __call__(self, *sequences: Sequence[object]) -> float:
         sequences = self._get_sequences(*sequences)
 
@@ -818,21 +2652,34 @@ class MLIPNS(_BaseSimilarity):
         if result is not None:
             return result
 
-        mismatches = 0
-        ham = Hamming()(*sequences)
-        maxlen = max(map(len, sequences))
-        while all(sequences) and mismatches <= self.maxmismatches:
-            if not maxlen:
-                return 1
-            if 1 - (maxlen - ham) / maxlen <= self.threshold:
-                return 1
-            mismatches += 1
-            ham -= 1
-            maxlen -= 1
-
-        if not maxlen:
-            return 1
-        return 0
+        ham = self._hamming(*sequences)
+        return self._decide(ham, max(map(len, sequences)))
+
+    def batch(self, query: Sequence[object], candidates: Iterable[Sequence[object]]) -> Any:
+        """Get results for `query` and every candidate.
+
+        If `candidates` is a 2-D numpy array with a sequence in every row,
+        Hamming distances are calculated at once and a numpy array is returned.
+        If `query` is a 2-D array too, it is compared with `candidates` row by row.
+        Otherwise, a list is returned.
+        """
+        if numpy is None or not isinstance(candidates, numpy.ndarray) or candidates.ndim != 2 or self.qval != 1:
+            return [self(query, candidate) for candidate in candidates]
+        query = self._hamming._query_array(query, candidates)
+
+        widths = (query.shape[-1], candidates.shape[-1])
+        ham = self._hamming.batch(query, candidates)  # type: ignore[arg-type]
+        # only one of sequences is empty
+        if min(widths) == 0 < max(widths):
+            return numpy.zeros_like(ham)
+        maxlen = max(widths)
+        if self.maxmismatches < 0:
+            result = ham == 0
+        elif maxlen <= self.maxmismatches + 1:
+            result = numpy.ones_like(ham, dtype=bool)
+        else:
+            result = (ham == 0) | (1 - (maxlen - ham) / (maxlen - self.maxmismatches) <= self.threshold)
+        return result.astype(int)
 
 
 hamming = Hamming()
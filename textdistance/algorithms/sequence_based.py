@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 # built-in
+from contextlib import suppress
 from difflib import SequenceMatcher as _SequenceMatcher
-from typing import Any
+from typing import Any, Sequence, TypeVar
 
 # app
 from ..utils import find_ngrams
@@ -23,6 +24,7 @@ __all__ = [
     'lcsseq', 'lcsstr', 'ratcliff_obershelp',
     'LCSSeq', 'LCSStr', 'RatcliffObershelp',
 ]
+T = TypeVar('T')
 
 
 class LCSSeq(_BaseSimilarity):
@@ -47,6 +49,13 @@ class LCSSeq(_BaseSimilarity):
         http://www.dis.uniroma1.it/~bonifaci/algo/LCSSEQ.py
         http://rosettacode.org/wiki/Longest_common_subsequence#Dynamic_Programming_8
         """
+        # the common prefix is a part of the LCS read out from the matrix below,
+        # so skipping it gives the same result. It is not true for the suffix.
+        if isinstance(seq1, str) and isinstance(seq2, str):
+            prefix, _ = self._common_affix(seq1, seq2)
+            if prefix:
+                return seq1[:prefix] + self._dynamic(seq1[prefix:], seq2[prefix:])
+
         lengths: Any
         if numpy:
             lengths = numpy.zeros((len(seq1) + 1, len(seq2) + 1), dtype=int)
@@ -98,7 +107,34 @@ class LCSSeq(_BaseSimilarity):
         else:
             return self._recursive(*sequences)
 
+    def _bit_parallel(self, seq1: Sequence[T], seq2: Sequence[T]) -> int:
+        """
+        Allison-Dix/Hyyrö bit-parallel algorithm for the LCS length.
+        A Python int is used as the bit vector of the row, so neither the matrix
+        nor the subsequence is built. Supports only hashable elements.
+
+        https://doi.org/10.1016/0020-0190(86)90091-8
+        https://www.researchgate.net/publication/2555924
+        """
+        prefix, suffix = self._common_affix(seq1, seq2)
+        seq1 = seq1[prefix:len(seq1) - suffix]
+        seq2 = seq2[prefix:len(seq2) - suffix]
+        if len(seq1) < len(seq2):
+            seq1, seq2 = seq2, seq1
+        masks = self._get_masks(seq1)
+        full = (1 << len(seq1)) - 1
+        # zero bits are the positions matched so far
+        v = full
+        for element in seq2:
+            matched = v & masks.get(element, 0)
+            v = ((v + matched) | (v - matched)) & full
+        return prefix + suffix + len(seq1) - bin(v).count('1')
+
     def similarity(self, *sequences) -> int:
+        prepared = self._get_sequences(*sequences)
+        if len(prepared) == 2:
+            with suppress(TypeError):  # unhashable elements
+                return self._bit_parallel(*prepared)
         return len(self(*sequences))
 
 
@@ -44,6 +44,8 @@ class Jaccard(_BaseSimilarity):
     def maximum(self, *sequences: Sequence) -> int:
         return 1
 
+    compile = _Base._compile_counters
+
     def __call__(self, *sequences: Sequence) -> float:
         result = self.quick_answer(*sequences)
         if result is not None:
@@ -76,6 +78,8 @@ class Sorensen(_BaseSimilarity):
     def maximum(self, *sequences: Sequence) -> int:
         return 1
 
+    compile = _Base._compile_counters
+
     def __call__(self, *sequences: Sequence) -> float:
         result = self.quick_answer(*sequences)
         if result is not None:
@@ -112,6 +116,8 @@ class Tversky(_BaseSimilarity):
     def maximum(self, *sequences: Sequence) -> int:
         return 1
 
+    compile = _Base._compile_counters
+
     def __call__(self, *sequences: Sequence) -> float:
         quick_result = self.quick_answer(*sequences)
         if quick_result is not None:
@@ -158,6 +164,8 @@ class Overlap(_BaseSimilarity):
     def maximum(self, *sequences: Sequence) -> int:
         return 1
 
+    compile = _Base._compile_counters
+
     def __call__(self, *sequences: Sequence) -> float:
         result = self.quick_answer(*sequences)
         if result is not None:
@@ -191,6 +199,8 @@ class Cosine(_BaseSimilarity):
     def maximum(self, *sequences: Sequence) -> int:
         return 1
 
+    compile = _Base._compile_counters
+
     def __call__(self, *sequences: Sequence) -> float:
         result = self.quick_answer(*sequences)
         if result is not None:
@@ -278,6 +288,8 @@ class Bag(_Base):
     https://github.com/Yomguithereal/talisman/blob/master/src/metrics/bag.js
     """
 
+    compile = _Base._compile_counters
+
     def __call__(self, *sequences: Sequence) -> float:
         sequences = self._get_counters(*sequences)              # sets
         intersection = self._intersect_counters(*sequences)     # set